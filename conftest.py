@@ -0,0 +1,67 @@
+"""
+Shared pytest configuration for SMSMaster
+"""
+import ipaddress
+import os
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the project root importable once per session instead of per test module;
+# pytest.ini collects with --import-mode=importlib, which adds nothing to sys.path
+PROJECT_ROOT = str(Path(__file__).resolve().parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Render Qt widgets off-screen unless a platform is chosen explicitly; headless
+# runs have no display, and exposure is immediate without a windowing system
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Only tests/ holds tests; src/utils/test_helpers.py matches test_*.py but is a
+# helper module that patches TwilioService on import
+collect_ignore = ["src"]
+
+_INTERNET_FAMILIES = (socket.AF_INET, socket.AF_INET6)
+
+
+def _is_loopback(address):
+    """Return True if a connect() address targets this machine"""
+    host = address[0] if isinstance(address, tuple) and address else address
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _block_internet(connect):
+    """Wrap a socket connect method so non-loopback internet connections raise"""
+    def blocked(sock, address, *args, **kwargs):
+        if sock.family in _INTERNET_FAMILIES and not _is_loopback(address):
+            raise RuntimeError("network disabled in tests")
+        return connect(sock, address, *args, **kwargs)
+    return blocked
+
+
+_BLOCKED_CONNECT = _block_internet(socket.socket.connect)
+_BLOCKED_CONNECT_EX = _block_internet(socket.socket.connect_ex)
+
+
+def pytest_configure(config):
+    """Register markers used by the shared fixtures"""
+    config.addinivalue_line("markers", "network: marks tests that require network access")
+
+
+@pytest.fixture(autouse=True)
+def _no_network(request, monkeypatch):
+    """
+    Fail fast on outbound internet connections unless the test is marked 'network'
+
+    Loopback addresses (127.0.0.0/8, ::1, localhost) stay reachable for local servers.
+    """
+    if request.node.get_closest_marker("network") is None:
+        monkeypatch.setattr(socket.socket, "connect", _BLOCKED_CONNECT)
+        monkeypatch.setattr(socket.socket, "connect_ex", _BLOCKED_CONNECT_EX)
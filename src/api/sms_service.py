@@ -2,25 +2,33 @@
 Base SMS service module and service response classes
 """
 import abc
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
 
+@dataclass(slots=True)
 class SMSResponse:
-    """Class to represent an SMS service response"""
+    """
+    Class to represent an SMS service response
     
-    def __init__(self, success: bool, message_id: str = None, error: str = None, details: Dict[str, Any] = None):
-        """
-        Initialize a new SMS response
-        
-        Args:
-            success: Whether the message was sent successfully
-            message_id: Unique message ID (for successful sends)
-            error: Error message (for failed sends)
-            details: Additional details or metadata
-        """
-        self.success = success
-        self.message_id = message_id
-        self.error = error
-        self.details = details or {}
+    Responses compare equal by field value, which leaves them unhashable;
+    use them as values, not as set members or dict keys.
+    
+    Attributes:
+        success: Whether the message was sent successfully
+        message_id: Unique message ID (for successful sends)
+        error: Error message (for failed sends)
+        details: Additional details or metadata
+    """
+    
+    success: bool
+    message_id: Optional[str] = None
+    error: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
+    
+    def __post_init__(self):
+        """Normalize missing details to an empty dict"""
+        if not self.details:
+            self.details = {}
     
     def __str__(self) -> str:
         """String representation of the response"""
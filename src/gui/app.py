@@ -29,7 +29,7 @@ from src.gui.templates_tab import TemplatesTab
 class SMSApplication(QMainWindow):
     """Main SMSMaster Application"""
     
-    def __init__(self, config=None, notification=None):
+    def __init__(self, config=None, notification=None, executor=None):
         """Initialize the application"""
         super().__init__()
         self.setWindowTitle("SMSMaster")
@@ -38,6 +38,10 @@ class SMSApplication(QMainWindow):
         self.config = config
         self.notification = notification
         
+        # Optional executor (anything with submit()) for message sends;
+        # without one, each send gets its own thread
+        self.executor = executor
+        
         # Set app icon if available
         try:
             icon_path = os.path.join(os.path.dirname(__file__), "assets", "sms_icon.png")
@@ -204,7 +208,8 @@ class SMSApplication(QMainWindow):
     
     def _start_background_tasks(self):
         """Start background tasks"""
-        # Start status updater
+        # Start status updater; it loops forever, so it stays on its own daemon
+        # thread rather than holding an executor worker
         self.status_update_thread = threading.Thread(target=self._update_status_periodically)
         self.status_update_thread.daemon = True
         self.status_update_thread.start()
@@ -300,10 +305,13 @@ class SMSApplication(QMainWindow):
             return False
         
         # Send in a background thread to avoid blocking UI
-        threading.Thread(
-            target=self._send_message_thread,
-            args=(recipient, message, service_name)
-        ).start()
+        if self.executor is not None:
+            self.executor.submit(self._send_message_thread, recipient, message, service_name)
+        else:
+            threading.Thread(
+                target=self._send_message_thread,
+                args=(recipient, message, service_name)
+            ).start()
         
         return True
     
@@ -5,6 +5,15 @@ import re
 import html
 from typing import Tuple, Optional, Any
 
+# Translation table that deletes characters not allowed in filenames
+_BAD_FILENAME_CHARS = str.maketrans('', '', '\\/*?:"<>|')
+
+# Characters that html.escape would replace
+_HTML_SPECIAL_CHARS = ('&', '<', '>', '"', "'")
+
+# Common formatting characters allowed in phone number input
+_PHONE_FORMATTING_RE = re.compile(r'[\s\-\(\)\.]')
+
 class InputValidator:
     """Input validation utilities for secure data handling"""
     
@@ -13,8 +22,11 @@ class InputValidator:
         """Sanitize text input to prevent HTML/script injection"""
         if not text:
             return ""
-        # Escape HTML special characters
-        return html.escape(text)
+        # Escape HTML special characters, skipping the copy when there are none
+        for ch in _HTML_SPECIAL_CHARS:
+            if ch in text:
+                return html.escape(text)
+        return text
     
     @staticmethod
     def validate_phone_input(phone: str) -> Tuple[bool, Optional[str]]:
@@ -22,15 +34,20 @@ class InputValidator:
         if not phone:
             return False, "Phone number is required"
             
-        # Remove common formatting characters for validation
-        clean_phone = re.sub(r'[\s\-\(\)\.]', '', phone)
-        
-        # Check if it's a reasonable phone number
-        # This is a basic validation; the phonenumbers library will do more thorough validation
-        if not clean_phone.replace('+', '').isdigit():
-            return False, "Phone number should contain only digits, spaces, and + - ( ) characters"
+        if phone.isdigit() or (phone[0] == '+' and phone[1:].isdigit()):
+            # Already unformatted digits, nothing to strip
+            clean_phone = phone
+        else:
+            # Remove common formatting characters for validation
+            clean_phone = _PHONE_FORMATTING_RE.sub('', phone)
+            
+            # Check if it's a reasonable phone number
+            # This is a basic validation; the phonenumbers library will do more thorough validation
+            digits = clean_phone[1:] if clean_phone[:1] == '+' else clean_phone
+            if not digits.isdigit():
+                return False, "Phone number should contain only digits, spaces, and + - ( ) characters"
             
-        if len(clean_phone) < 7 or len(clean_phone) > 15:
+        if not 7 <= len(clean_phone) <= 15:
             return False, "Phone number length is invalid"
             
         return True, None
@@ -63,8 +80,7 @@ class InputValidator:
     def sanitize_filename(filename: str) -> str:
         """Sanitize a filename to prevent path traversal attacks"""
         # Remove any directory components
-        safe_name = re.sub(r'[\\/*?:"<>|]', '', filename)
-        safe_name = safe_name.replace('..', '')
+        safe_name = filename.translate(_BAD_FILENAME_CHARS).replace('..', '')
         
         # Ensure it's not empty after sanitization
         if not safe_name:
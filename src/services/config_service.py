@@ -27,10 +27,10 @@ class ConfigService:
         """Load configuration from JSON file"""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r') as f:
-                    self.settings = json.load(f)
-            except json.JSONDecodeError:
-                # If the file is corrupted, start with empty settings
+                self.settings = json.loads(self.config_file.read_bytes())
+            except ValueError:
+                # If the file is corrupted or not UTF-8 (JSONDecodeError and
+                # UnicodeDecodeError are both ValueErrors), start with empty settings
                 self.settings = {}
                 self._save_config()
         else:
@@ -39,10 +39,11 @@ class ConfigService:
             self._save_config()
     
     def _save_config(self):
-        """Save configuration to JSON file"""
+        """Save configuration to JSON file in compact form"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            self.config_file.write_bytes(
+                json.dumps(self.settings, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+            )
             return True
         except Exception:
             return False
@@ -164,4 +165,22 @@ class ConfigService:
         Returns:
             True if successful, False otherwise
         """
-        return self._save_config() 
\ No newline at end of file
+        return self._save_config() 
+    
+    def export(self, path) -> bool:
+        """
+        Export current settings as indented, human-readable JSON
+        
+        Args:
+            path: Destination file path
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            Path(path).write_text(
+                json.dumps(self.settings, indent=2, ensure_ascii=False), encoding='utf-8'
+            )
+            return True
+        except Exception:
+            return False
\ No newline at end of file
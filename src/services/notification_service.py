@@ -4,8 +4,9 @@ Provides cross-platform notification functionality
 """
 import os
 import sys
+import base64
 import platform
-import tempfile
+import subprocess
 from typing import Optional
 from pathlib import Path
 
@@ -50,19 +51,17 @@ class NotificationService:
             [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("{self.app_name}").Show($toast)
             '''
             
-            # Save command to temporary file to avoid command line length issues
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.ps1') as temp:
-                temp.write(powershell_cmd.encode('utf-8'))
-                temp_path = temp.name
+            # Pass the script as base64-encoded UTF-16LE instead of writing a temp file
+            encoded = base64.b64encode(powershell_cmd.encode('utf-16-le')).decode('ascii')
             
-            # Execute the PowerShell script
-            os.system(f'powershell -ExecutionPolicy Bypass -File "{temp_path}"')
-            
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
+            # Execute the PowerShell script and wait for it, as os.system did
+            subprocess.run(
+                ['powershell', '-NoProfile', '-ExecutionPolicy', 'Bypass', '-EncodedCommand', encoded],
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False
+            )
                 
         except Exception:
             # Fallback to console output
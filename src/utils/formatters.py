@@ -1,10 +1,20 @@
 """
 Formatting utilities for SMS application
 """
-import re
 import phonenumbers
 from typing import Tuple, Optional
 
+# Characters accepted as GSM-7; other Unicode whitespace is accepted via str.isspace
+_GSM7_CHARS = frozenset(
+    '@£$¥èéùìòÇØøÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ!"#¤%&\'()*+,-./:;<=>?¡'
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà'
+    ' \t\n\r\f\v'
+)
+
+# (chars_per_sms, chars_per_concat_sms) keyed by whether the message is GSM-7
+# Concatenated parts lose 7 (GSM-7) or 3 (Unicode) characters to the UDH header
+_SMS_PART_SIZES = {True: (160, 153), False: (70, 67)}
+
 def format_phone_number(phone: str, country_code: str = "US") -> Tuple[bool, Optional[str]]:
     """
     Format a phone number to E.164 format
@@ -53,22 +63,12 @@ def get_message_parts(message: str) -> Tuple[int, int]:
     # GSM-7 encoding allows 160 chars per SMS
     # Unicode messages are limited to 70 chars per SMS
     
-    # Check if message contains characters outside GSM-7 charset
-    gsm_pattern = r'^[@£$¥èéùìòÇØøÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ!\"\#¤%&\'()*+,\-./:;<=>?¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà\s]*$'
-    
-    if re.match(gsm_pattern, message):
-        # GSM-7 encoding
-        chars_per_sms = 160
-        chars_per_concat_sms = 153  # 160 - 7 bytes used for UDH header
-    else:
-        # Unicode encoding
-        chars_per_sms = 70
-        chars_per_concat_sms = 67  # 70 - 3 bytes used for UDH header
+    # Check the distinct characters against the GSM-7 charset
+    extra = set(message) - _GSM7_CHARS
+    is_gsm = not extra or all(ch.isspace() for ch in extra)
+    chars_per_sms, chars_per_concat_sms = _SMS_PART_SIZES[is_gsm]
     
-    if count <= chars_per_sms:
-        parts = 1
-    else:
-        parts = (count + chars_per_concat_sms - 1) // chars_per_concat_sms
+    parts = 1 if count <= chars_per_sms else -(-count // chars_per_concat_sms)
     
     return count, parts
 
@@ -2,15 +2,109 @@
 Logging utilities for SMS application
 """
 import os
+import sys
 import logging
+import threading
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from datetime import datetime
 
+# Formatters are built once at import time
+_CONSOLE_FMT = logging.Formatter('%(levelname)s: %(message)s')
+_FILE_FMT = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# Shared handlers attached to every logger set up without a log_file, built
+# lazily on first use. They are the same objects on every such logger: closing
+# them through one logger closes them for all (a closed file handler reopens on
+# its next record), and they carry no level of their own, so filtering happens
+# at each logger's level. The default file handler is rebuilt for the first
+# logger set up on a new day, swapped in on every logger holding the old one,
+# and the old one is closed.
+_CONSOLE_HANDLER = None
+_FILE_HANDLER = None
+_FILE_HANDLER_DATE = None
+_HANDLER_LOCK = threading.Lock()
+
+
+def _default_log_path(today):
+    """Return the default log file path for the given date string"""
+    return Path.home() / '.sms_sender' / 'logs' / f"sms_sender_{today}.log"
+
+
+def _create_file_handler(log_path):
+    """Create a rotating UTF-8 file handler for the given path"""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = RotatingFileHandler(
+        log_path,
+        maxBytes=5*1024*1024,  # 5 MB
+        backupCount=5,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(_FILE_FMT)
+    return file_handler
+
+
+def _replace_handler(old_handler, new_handler):
+    """Swap old_handler for new_handler on every logger holding it, then close it"""
+    loggers = [logging.getLogger(), *logging.Logger.manager.loggerDict.values()]
+    for logger in loggers:
+        # Placeholders in the logger tree have no handlers
+        if old_handler in getattr(logger, 'handlers', ()):
+            logger.removeHandler(old_handler)
+            logger.addHandler(new_handler)
+    old_handler.close()
+
+
+def _init_default_handlers():
+    """
+    Build the shared console and default file handlers
+
+    Handlers that fail to build are left unset so a later call can retry.
+    """
+    global _CONSOLE_HANDLER, _FILE_HANDLER, _FILE_HANDLER_DATE
+
+    with _HANDLER_LOCK:
+        if _CONSOLE_HANDLER is None:
+            try:
+                # Create console handler with UTF-8 support
+                console_handler = logging.StreamHandler(sys.stdout)
+                console_handler.setFormatter(_CONSOLE_FMT)
+                # Ensure UTF-8 encoding for console output
+                if hasattr(console_handler.stream, 'reconfigure'):
+                    try:
+                        console_handler.stream.reconfigure(encoding='utf-8')
+                    except Exception:
+                        pass  # Ignore if reconfigure not available
+                _CONSOLE_HANDLER = console_handler
+            except Exception as e:
+                # Fallback if console handler fails
+                print(f"Warning: Could not create console handler: {e}")
+
+        today = datetime.now().strftime('%Y-%m-%d')
+        if _FILE_HANDLER is None or _FILE_HANDLER_DATE != today:
+            try:
+                file_handler = _create_file_handler(_default_log_path(today))
+            except (PermissionError, OSError) as e:
+                # Fallback if file handler fails (permission issues, etc.)
+                print(f"Warning: Could not create file handler for default location: {e}")
+            except Exception as e:
+                print(f"Warning: Unexpected error creating file handler: {e}")
+            else:
+                if _FILE_HANDLER is not None:
+                    _replace_handler(_FILE_HANDLER, file_handler)
+                _FILE_HANDLER = file_handler
+                _FILE_HANDLER_DATE = today
+
+    return _CONSOLE_HANDLER, _FILE_HANDLER
+
+
 def setup_logger(name="sms_sender", log_level=logging.INFO, level=None, log_file=None):
     """
     Set up a logger with console and file handlers
     
+    Without log_file the logger gets the module's shared console and default
+    file handlers, so the level applies to the logger rather than the handlers.
+    
     Args:
         name: Logger name (default: "sms_sender")
         log_level: Logging level (default: logging.INFO)
@@ -32,53 +126,21 @@ def setup_logger(name="sms_sender", log_level=logging.INFO, level=None, log_file
     if logger.handlers:
         return logger
     
-    # Create formatters
-    console_formatter = logging.Formatter('%(levelname)s: %(message)s')
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    try:
-        # Create console handler with UTF-8 support
-        import sys
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(console_formatter)
-        console_handler.setLevel(log_level)
-        # Ensure UTF-8 encoding for console output
-        if hasattr(console_handler.stream, 'reconfigure'):
-            try:
-                console_handler.stream.reconfigure(encoding='utf-8')
-            except Exception:
-                pass  # Ignore if reconfigure not available
+    console_handler, default_file_handler = _init_default_handlers()
+    if console_handler is not None:
         logger.addHandler(console_handler)
-    except Exception as e:
-        # Fallback if console handler fails
-        print(f"Warning: Could not create console handler: {e}")
     
-    # Create file handler
+    if not log_file:
+        if default_file_handler is not None:
+            logger.addHandler(default_file_handler)
+        return logger
+    
+    # A specific log file gets its own handler
     try:
-        if log_file:
-            # Use specified log file
-            log_path = Path(log_file)
-            # Create parent directory if it doesn't exist
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-        else:
-            # Use default log file location
-            log_dir = Path.home() / '.sms_sender' / 'logs'
-            log_dir.mkdir(parents=True, exist_ok=True)
-            today = datetime.now().strftime('%Y-%m-%d')
-            log_path = log_dir / f"sms_sender_{today}.log"
-        
-        file_handler = RotatingFileHandler(
-            log_path, 
-            maxBytes=5*1024*1024,  # 5 MB
-            backupCount=5,
-            encoding='utf-8'
-        )
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(log_level)
-        logger.addHandler(file_handler)
+        logger.addHandler(_create_file_handler(Path(log_file)))
     except (PermissionError, OSError) as e:
         # Fallback if file handler fails (permission issues, etc.)
-        print(f"Warning: Could not create file handler for {log_file or 'default location'}: {e}")
+        print(f"Warning: Could not create file handler for {log_file}: {e}")
     except Exception as e:
         print(f"Warning: Unexpected error creating file handler: {e}")
     
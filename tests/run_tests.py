@@ -4,52 +4,77 @@ Test runner for SMSMaster application
 """
 import os
 import sys
-import unittest
+import subprocess
+import importlib.util
 import coverage
+import pytest
 
 # Add project root to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+COVERAGE_CONFIG = os.path.join(project_root, '.coveragerc')
+COVERAGE_OMIT = [
+    '*/tests/*',
+    '*/gui/*',  # Omit GUI modules for now
+    '*/__pycache__/*',
+    '*/__init__.py'
+]
+
 def run_tests_with_coverage():
     """Run all tests with coverage reporting"""
-    # Start coverage measurement
-    cov = coverage.Coverage(
-        source=['src'],
-        omit=[
-            '*/tests/*',
-            '*/gui/*',  # Omit GUI modules for now
-            '*/__pycache__/*',
-            '*/__init__.py'
-        ]
-    )
-    cov.start()
-    
-    # Discover and run tests
-    loader = unittest.TestLoader()
     tests_dir = os.path.dirname(os.path.abspath(__file__))
-    suite = loader.discover(tests_dir)
+    
+    # Prefer the sys.monitoring (PEP 669) tracer, which is much cheaper than settrace.
+    # coverage.py can only measure branches with it from Python 3.14, so fall back to
+    # the C tracer before that. Workers inherit the environment; an explicit value wins.
+    os.environ.setdefault('COVERAGE_CORE', 'sysmon' if sys.version_info >= (3, 14) else 'ctrace')
+    
+    # Coverage is collected by pytest-cov so xdist workers are traced and combined.
+    # Thread concurrency tracing comes from .coveragerc; tests themselves are not run
+    # on threads because mock.patch mutates process-global state.
+    # importlib import mode skips sys.path insertion per test directory; the root
+    # conftest.py already makes the project importable
+    args = [
+        tests_dir,
+        '--import-mode=importlib',
+        f"--cov={os.path.join(project_root, 'src')}",
+        f"--cov-config={COVERAGE_CONFIG}",
+        '--cov-report=',
+        '--cov-fail-under=0'
+    ]
+    # Forward pytest options such as --lf/--nf, which reuse pytest's own on-disk cache,
+    # together with their values (e.g. --maxfail 3, -k expr); --html is the runner's own
+    args += [arg for arg in sys.argv[1:] if arg != '--html']
+    if importlib.util.find_spec('xdist') is not None:
+        # src/utils/test_helpers.py, whose TwilioService patch once tied files to one
+        # worker, is only imported by a fixture that undoes the patch; the tests' own
+        # patchers also live in per-module fixtures, so any worker can take any test. worksteal rebalances
+        # when one worker draws the slow GUI tests.
+        # A fixed hash seed keeps set/dict ordering identical across workers
+        os.environ.setdefault('PYTHONHASHSEED', '0')
+        args += ['-n', 'auto', '--dist=worksteal']
     
     # Run the tests
     print("\n========== Running Tests ==========\n")
-    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    exit_code = pytest.main(args)
     
-    # Stop coverage measurement
-    cov.stop()
-    cov.save()
+    # Load the combined coverage data
+    cov = coverage.Coverage(config_file=COVERAGE_CONFIG)
+    cov.load()
     
     # Report coverage results
     print("\n========== Coverage Report ==========\n")
-    cov.report()
+    cov.report(omit=COVERAGE_OMIT)
     
     # Save HTML report if requested
     if '--html' in sys.argv:
         html_dir = os.path.join(tests_dir, 'coverage_html')
         print(f"\nGenerating HTML coverage report in {html_dir}")
-        cov.html_report(directory=html_dir)
+        cov.html_report(directory=html_dir, omit=COVERAGE_OMIT)
     
-    return len(result.failures) + len(result.errors)
+    return int(exit_code)
 
 def run_specific_test(test_path):
     """Run a specific test file or test case"""
@@ -57,13 +82,19 @@ def run_specific_test(test_path):
         print(f"Error: Test file {test_path} not found")
         return 1
     
+    # Forward any extra arguments (e.g. -k expr, -x) to pytest unchanged
+    options = [arg for arg in sys.argv[2:] if arg != '--subprocess']
+    
     # Run the specific test
     print(f"\n========== Running Test: {test_path} ==========\n")
-    return os.system(f"{sys.executable} {test_path}")
+    if '--subprocess' in sys.argv[2:]:
+        # Isolated interpreter for tests that need a fresh process, without going through a shell
+        return subprocess.run([sys.executable, '-m', 'pytest', test_path] + options, check=False).returncode
+    return int(pytest.main([test_path] + options))
 
 def main():
     """Main entry point for test runner"""
-    if len(sys.argv) > 1 and not sys.argv[1].startswith('--'):
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('-'):
         # Run a specific test
         return run_specific_test(sys.argv[1])
     else:
@@ -71,4 +102,4 @@ def main():
         return run_tests_with_coverage()
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
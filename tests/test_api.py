@@ -2,19 +2,55 @@
 """
 Test script for SMSMaster API services
 """
-import os
+import importlib
 import sys
+import types
 import unittest
-from unittest.mock import MagicMock, patch
+from types import MappingProxyType
+from unittest.mock import DEFAULT, MagicMock, create_autospec, patch
 
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Import application modules
+# Import application modules; provider services are imported by their test
+# classes so selecting the base API tests does not load twilio or requests
 from src.api.sms_service import SMSService, SMSResponse
 from src.api.service_manager import SMSServiceManager
-from src.api.twilio_service import TwilioService
-from src.api.textbelt_service import TextBeltService
+
+class _StubRequestException(Exception):
+    """Stand-in for requests.RequestException in the stub module"""
+
+def _make_requests_stub():
+    """Build a lightweight replacement for the requests module"""
+    stub = types.ModuleType('requests')
+    stub.post = MagicMock()
+    stub.get = MagicMock()
+    stub.RequestException = _StubRequestException
+    return stub
+
+# Read-only credentials shared by the service tests
+_TWILIO_CREDS = MappingProxyType({
+    "account_sid": "AC123",
+    "auth_token": "token123",
+    "from_number": "+15551234567"
+})
+_TEXTBELT_CREDS = MappingProxyType({
+    "api_key": "textbelt_test"
+})
+
+# Canned provider responses shared by the send tests
+_TWILIO_OK_MSG = types.SimpleNamespace(
+    sid="SM123",
+    status="sent",
+    error_code=None,
+    error_message=None
+)
+_TEXTBELT_OK_JSON = MappingProxyType({
+    "success": True,
+    "textId": "TB123",
+    "quotaRemaining": 99
+})
+
+def _json_response(payload, status_code=200):
+    """Build a minimal HTTP response whose json() returns the given payload"""
+    return types.SimpleNamespace(json=lambda: payload, status_code=status_code)
 
 class TestSMSResponse(unittest.TestCase):
     """Test case for SMS Response class"""
@@ -27,15 +63,11 @@ class TestSMSResponse(unittest.TestCase):
             details={"status": "sent", "cost": 0.01}
         )
         
-        self.assertTrue(response.success)
-        self.assertEqual(response.message_id, "msg123")
-        self.assertEqual(response.details["status"], "sent")
-        self.assertIsNone(response.error)
+        actual = (response.success, response.message_id, response.error, response.details["status"])
+        self.assertEqual(actual, (True, "msg123", None, "sent"))
         
         # Test string representation
-        response_str = str(response)
-        self.assertIn("Success", response_str)
-        self.assertIn("msg123", response_str)
+        self.assertRegex(str(response), r"Success.*msg123")
     
     def test_error_response(self):
         """Test error SMS response"""
@@ -45,15 +77,34 @@ class TestSMSResponse(unittest.TestCase):
             details={"code": 401, "reason": "Invalid credentials"}
         )
         
-        self.assertFalse(response.success)
-        self.assertEqual(response.error, "Authentication failed")
-        self.assertEqual(response.details["code"], 401)
-        self.assertIsNone(response.message_id)
+        actual = (response.success, response.message_id, response.error, response.details["code"])
+        self.assertEqual(actual, (False, None, "Authentication failed", 401))
         
         # Test string representation
-        response_str = str(response)
-        self.assertIn("Failed", response_str)
-        self.assertIn("Authentication failed", response_str)
+        self.assertRegex(str(response), r"Failed.*Authentication failed")
+    
+    def test_response_has_no_instance_dict(self):
+        """Test that responses use slots rather than a per-instance dict"""
+        response = SMSResponse(success=True, message_id="msg123")
+        
+        self.assertFalse(hasattr(response, "__dict__"))
+        self.assertEqual(response.details, {})
+        with self.assertRaises(AttributeError):
+            response.unexpected = "value"
+    
+    def test_responses_compare_by_value(self):
+        """Test that responses with the same fields compare equal"""
+        self.assertEqual(
+            SMSResponse(False, error="Timeout"),
+            SMSResponse(success=False, error="Timeout", details={})
+        )
+        self.assertNotEqual(SMSResponse(True, "msg1"), SMSResponse(True, "msg2"))
+    
+    def test_response_is_unhashable(self):
+        """Test that value equality leaves responses unhashable"""
+        self.assertIsNone(SMSResponse.__hash__)
+        with self.assertRaises(TypeError):
+            {SMSResponse(True, "msg1")}
 
 class MockSMSService(SMSService):
     """Mock implementation of SMSService for testing"""
@@ -79,10 +130,14 @@ class MockSMSService(SMSService):
 class TestSMSService(unittest.TestCase):
     """Test case for base SMS Service class"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create the mock service once for the class"""
+        cls.service = MockSMSService()
+    
     def test_mock_service(self):
         """Test mock service implementation"""
-        # Create instance of mock service
-        service = MockSMSService()
+        service = self.service
         
         # Test service properties
         self.assertEqual(service.service_name, "Mock SMS Service")
@@ -92,119 +147,106 @@ class TestSMSService(unittest.TestCase):
         response = service.send_sms("+12125551234", "Test message")
         self.assertTrue(response.success)
         
-        balance = service.check_balance()
-        self.assertEqual(balance["balance"], 100)
-        
-        quota = service.get_remaining_quota()
-        self.assertEqual(quota, 50)
-        
-        status = service.get_delivery_status("msg-123")
-        self.assertEqual(status["status"], "delivered")
-        
-        valid = service.validate_credentials()
-        self.assertTrue(valid)
+        cases = [
+            (service.check_balance, (), {"balance": 100}),
+            (service.get_remaining_quota, (), 50),
+            (service.get_delivery_status, ("msg-123",), {"status": "delivered"}),
+            (service.validate_credentials, (), True),
+        ]
+        for method, args, expected in cases:
+            with self.subTest(method=method.__name__):
+                self.assertEqual(method(*args), expected)
 
 class TestTwilioService(unittest.TestCase):
     """Test case for Twilio Service"""
     
-    def setUp(self):
-        """Set up test environment"""
-        # Mock the twilio.rest.Client completely
-        self.mock_client_patcher = patch('twilio.rest.Client')
-        self.mock_client_class = self.mock_client_patcher.start()
-        
-        # Mock the TwilioRestException
-        self.mock_exception_patcher = patch('twilio.base.exceptions.TwilioRestException')
-        self.mock_twilio_exception = self.mock_exception_patcher.start()
-        
-        # Mock credentials
-        self.credentials = {
-            "account_sid": "AC123",
-            "auth_token": "token123",
-            "from_number": "+15551234567"
-        }
+    @classmethod
+    def setUpClass(cls):
+        """Set up patchers and the configured service once for the class"""
+        from src.api import twilio_service
+        cls.TwilioService = twilio_service.TwilioService
+        cls.TwilioClient = twilio_service.Client
+        
+        # Mock the Twilio client and exception where the service looks them up;
+        # the patch is undone automatically after the class, even if setup fails
+        mocks = cls.enterClassContext(patch.multiple(
+            twilio_service,
+            Client=DEFAULT,
+            TwilioRestException=DEFAULT
+        ))
+        cls.mock_client_class = mocks['Client']
+        cls.mock_twilio_exception = mocks['TwilioRestException']
         
         # Create the service
-        self.service = TwilioService()
+        cls.service = cls.TwilioService()
         
-        # Skip actual validation in configure method
-        with patch.object(self.service, 'validate_credentials', return_value=True):
-            self.service.configure(self.credentials)
+        # Skip actual validation by shadowing the bound method on the instance
+        cls.service.validate_credentials = lambda: True
+        cls.configure_result = cls.service.configure(_TWILIO_CREDS)
     
-    def tearDown(self):
-        """Clean up test environment"""
-        self.mock_client_patcher.stop()
-        self.mock_exception_patcher.stop()
+    def setUp(self):
+        """Reset per-test state on the shared mocks and service"""
+        self.mock_client_class.reset_mock()
+        self.service.client = None
     
     def test_service_properties(self):
         """Test service properties"""
         self.assertEqual(self.service.service_name, "Twilio")
     
-    @patch.object(TwilioService, 'validate_credentials')
-    def test_configure(self, mock_validate):
+    def test_configure(self):
         """Test service configuration"""
-        # Set validate_credentials to return True
-        mock_validate.return_value = True
-        
-        # Create a new service
-        service = TwilioService()
-        
-        # Configure it
-        result = service.configure(self.credentials)
-        
-        # Check that it was configured correctly
-        self.assertTrue(result)
-        self.assertEqual(service.account_sid, "AC123")
-        self.assertEqual(service.auth_token, "token123")
-        self.assertEqual(service.from_number, "+15551234567")
+        # setUpClass configured the shared service; check the resulting state
+        service = self.service
+        self.assertEqual(
+            (self.configure_result, service.account_sid, service.auth_token, service.from_number),
+            (True, "AC123", "token123", "+15551234567")
+        )
     
     def test_send_sms(self):
         """Test sending message via Twilio"""
+        service = self.service
+        
         # Mock the client and message response
-        mock_client = MagicMock()
+        mock_client = create_autospec(self.TwilioClient, instance=True)
         self.mock_client_class.return_value = mock_client
         
-        # Create mock message response
-        mock_message = MagicMock()
-        mock_message.sid = "SM123"
-        mock_message.status = "sent"
-        mock_message.error_code = None
-        mock_message.error_message = None
-        
         # Set up the mock to return our message
-        mock_client.messages.create.return_value = mock_message
+        mock_client.messages.create.return_value = _TWILIO_OK_MSG
         
         # Mock the service.client with our mock client
-        self.service.client = mock_client
+        service.client = mock_client
         
         # Test sending a message
-        response = self.service.send_sms("+12125551234", "Test message")
+        response = service.send_sms("+12125551234", "Test message")
         
         # Verify the response
-        self.assertTrue(response.success)
-        self.assertEqual(response.message_id, "SM123")
-        self.assertEqual(response.details["status"], "sent")
+        actual = (response.success, response.message_id, response.error, response.details["status"])
+        self.assertEqual(actual, (True, "SM123", None, "sent"))
         
         # Verify the client was called correctly
-        mock_client.messages.create.assert_called_once()
-        args, kwargs = mock_client.messages.create.call_args
-        self.assertEqual(kwargs["to"], "+12125551234")
-        self.assertEqual(kwargs["from_"], "+15551234567")
-        self.assertEqual(kwargs["body"], "Test message")
+        create = mock_client.messages.create
+        self.assertEqual(create.call_count, 1)
+        self.assertEqual(create.call_args.kwargs, {
+            "to": "+12125551234",
+            "from_": "+15551234567",
+            "body": "Test message"
+        })
     
     def test_send_sms_error(self):
         """Test sending message with error"""
+        service = self.service
+        
         # Mock the client
-        mock_client = MagicMock()
+        mock_client = create_autospec(self.TwilioClient, instance=True)
         
         # Set the client on the service
-        self.service.client = mock_client
+        service.client = mock_client
         
         # Make the client raise a general exception
         mock_client.messages.create.side_effect = Exception("API Error")
         
         # Test sending message
-        response = self.service.send_sms("+12125551234", "Test message")
+        response = service.send_sms("+12125551234", "Test message")
         
         # Verify response
         self.assertFalse(response.success)
@@ -213,32 +255,33 @@ class TestTwilioService(unittest.TestCase):
 class TestTextBeltService(unittest.TestCase):
     """Test case for TextBelt Service"""
     
-    def setUp(self):
-        """Set up test environment"""
-        # Mock requests module
-        self.requests_patch = patch('requests.post')
-        self.requests_get_patch = patch('requests.get')
-        
-        # Start the patches
-        self.mock_post = self.requests_patch.start()
-        self.mock_get = self.requests_get_patch.start()
-        
-        # Mock credentials
-        self.credentials = {
-            "api_key": "textbelt_test"
-        }
+    @classmethod
+    def setUpClass(cls):
+        """Set up patchers and the configured service once for the class"""
+        import src.api
+        
+        # Install a lightweight requests stub, then import a fresh textbelt_service
+        # that binds it; both patches restore the modules other tests see
+        cls.requests_stub = _make_requests_stub()
+        cls.enterClassContext(patch.dict(sys.modules, {'requests': cls.requests_stub}))
+        sys.modules.pop('src.api.textbelt_service', None)
+        cls.enterClassContext(patch.object(src.api, 'textbelt_service', None, create=True))
+        textbelt_service = importlib.import_module('src.api.textbelt_service')
+        cls.TextBeltService = textbelt_service.TextBeltService
+        cls.mock_post = cls.requests_stub.post
+        cls.mock_get = cls.requests_stub.get
         
         # Create service
-        self.service = TextBeltService()
+        cls.service = cls.TextBeltService()
         
-        # Skip actual validation
-        with patch.object(self.service, 'validate_credentials', return_value=True):
-            self.service.configure(self.credentials)
+        # Skip actual validation by shadowing the bound method on the instance
+        cls.service.validate_credentials = lambda: True
+        cls.service.configure(_TEXTBELT_CREDS)
     
-    def tearDown(self):
-        """Clean up test environment"""
-        self.requests_patch.stop()
-        self.requests_get_patch.stop()
+    def setUp(self):
+        """Reset call history on the shared request mocks"""
+        self.mock_post.reset_mock()
+        self.mock_get.reset_mock()
     
     def test_service_properties(self):
         """Test service properties"""
@@ -246,53 +289,37 @@ class TestTextBeltService(unittest.TestCase):
     
     def test_send_sms(self):
         """Test sending message via TextBelt"""
+        mock_post = self.mock_post
+        
         # Set up the mock response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "success": True,
-            "textId": "TB123",
-            "quotaRemaining": 99
-        }
-        self.mock_post.return_value = mock_response
+        mock_post.return_value = _json_response(_TEXTBELT_OK_JSON)
         
         # Send a test message
         response = self.service.send_sms("+12125551234", "Test message")
         
         # Verify the response
-        self.assertTrue(response.success)
-        self.assertEqual(response.message_id, "TB123")
-        self.assertEqual(response.details["quotaRemaining"], 99)
+        actual = (response.success, response.message_id, response.error, response.details["quotaRemaining"])
+        self.assertEqual(actual, (True, "TB123", None, 99))
         
         # Verify API was called correctly
-        self.mock_post.assert_called_once()
-        call_args = self.mock_post.call_args
-        
-        # The first positional argument should be the URL
-        self.assertEqual(call_args[0][0], "https://textbelt.com/text")
-        
-        # Extract the payload data (could be in 'data' or as a positional argument)
-        if hasattr(call_args, 'kwargs') and call_args.kwargs.get('data'):
-            payload = call_args.kwargs.get('data')
-        else:
-            # If not in kwargs, it might be the second positional argument
-            payload = call_args[0][1] if len(call_args[0]) > 1 else None
-        
-        # Now verify the payload data
-        self.assertIsNotNone(payload, "Payload data is missing in the API call")
-        if payload:  # Only run these assertions if we found the payload
-            self.assertEqual(payload.get("phone"), "+12125551234")
-            self.assertEqual(payload.get("message"), "Test message")
-            self.assertEqual(payload.get("key"), "textbelt_test")
+        mock_post.assert_called_once()
+        
+        # The URL and payload are passed positionally
+        url, payload = mock_post.call_args.args
+        self.assertEqual(url, "https://textbelt.com/text")
+        self.assertEqual(payload, {
+            "phone": "+12125551234",
+            "message": "Test message",
+            "key": "textbelt_test"
+        })
     
     def test_send_sms_error(self):
         """Test sending message with error"""
         # Set up the mock response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+        self.mock_post.return_value = _json_response({
             "success": False,
             "error": "Invalid phone number"
-        }
-        self.mock_post.return_value = mock_response
+        })
         
         # Send a test message
         response = self.service.send_sms("+12125551234", "Test message")
@@ -301,18 +328,43 @@ class TestTextBeltService(unittest.TestCase):
         self.assertFalse(response.success)
         self.assertEqual(response.error, "Invalid phone number")
 
+class _StubDB:
+    """Minimal stand-in for the Database used by SMSServiceManager"""
+    
+    __slots__ = ('credentials',)
+    
+    def __init__(self):
+        self.credentials = None
+    
+    def get_active_services(self):
+        return []
+    
+    def get_api_credentials(self, service_name):
+        return self.credentials
+    
+    def save_api_credentials(self, service_name, credentials, is_active=False):
+        return True
+
 class TestSMSServiceManager(unittest.TestCase):
     """Test case for SMS Service Manager"""
     
-    def setUp(self):
-        """Set up test environment"""
-        # Create mock database
-        self.db = MagicMock()
-        self.db.get_active_services.return_value = []
-        self.db.get_api_credentials.return_value = None
+    @classmethod
+    def setUpClass(cls):
+        """Build the manager and its services once for the class"""
+        # Create stub database
+        cls.db = _StubDB()
         
         # Create service manager
-        self.manager = SMSServiceManager(self.db)
+        cls.manager = SMSServiceManager(cls.db)
+        
+        # Services are constructed once by the manager and reused across tests
+        cls._twilio = cls.manager.get_service_by_name("twilio")
+        cls._textbelt = cls.manager.get_service_by_name("textbelt")
+    
+    def setUp(self):
+        """Reset state mutated by individual tests"""
+        self.db.credentials = None
+        self.manager.active_service = None
     
     def test_get_available_services(self):
         """Test getting available services"""
@@ -325,12 +377,12 @@ class TestSMSServiceManager(unittest.TestCase):
         """Test getting service by name"""
         # Get Twilio service
         twilio = self.manager.get_service_by_name("twilio")
-        self.assertIsNotNone(twilio)
+        self.assertIs(twilio, self._twilio)
         self.assertEqual(twilio.service_name, "Twilio")
         
         # Get TextBelt service
         textbelt = self.manager.get_service_by_name("textbelt")
-        self.assertIsNotNone(textbelt)
+        self.assertIs(textbelt, self._textbelt)
         self.assertEqual(textbelt.service_name, "TextBelt")
         
         # Get non-existent service
@@ -339,14 +391,15 @@ class TestSMSServiceManager(unittest.TestCase):
     
     def test_set_active_service(self):
         """Test setting active service"""
-        # Mock get_api_credentials to return credentials
-        self.db.get_api_credentials.return_value = {"api_key": "test"}
+        # Have the stub database return credentials
+        self.db.credentials = {"api_key": "test"}
         
         # Set active service
         result = self.manager.set_active_service("twilio")
         self.assertTrue(result)
         
         # Verify active service was set
+        self.assertIs(self.manager.active_service, self._twilio)
         self.assertEqual(self.manager.active_service.service_name, "Twilio")
         
         # Test with invalid service name
@@ -2,65 +2,86 @@
 """
 Test script for SMSMaster API services with additional coverage
 """
-import os
-import sys
+import copy
+import types
 import pytest
 from unittest.mock import MagicMock, patch
 import requests
 import json
-from twilio.base.exceptions import TwilioRestException
-
-# Add project root to path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
 
 # Import application modules
 from src.api.sms_service import SMSService, SMSResponse
-from src.api.twilio_service import TwilioService
 from src.api.textbelt_service import TextBeltService
 
 
+# Shared side effect for the JSON decode error paths; raising it does not mutate it
+_JSON_ERR = json.JSONDecodeError("Invalid JSON", "", 0)
+
+# Expected Twilio send results; only compared against, never mutated
+_SENT_SMS = SMSResponse(
+    success=True,
+    message_id="SM123",
+    details={
+        "status": "sent",
+        "price": "0.0075",
+        "price_unit": "USD",
+        "date_created": "2023-07-01 12:30:00"
+    }
+)
+_ERR_INVALID_NUMBER = SMSResponse(
+    success=False,
+    error="Twilio API error: Invalid phone number",
+    details={"code": 21211, "status": 400, "more_info": None}
+)
+_ERR_NETWORK = SMSResponse(success=False, error="Error: Network error")
+
+
+def _resp(status_code=200, payload=None):
+    """Build a minimal HTTP response with a status code and JSON payload"""
+    return types.SimpleNamespace(status_code=status_code, json=lambda: payload)
+
+
+@pytest.fixture(scope="class")
+def requests_mocks(request):
+    """Patch requests.post and requests.get once for the whole test class"""
+    with patch('requests.post') as mock_post, patch('requests.get') as mock_get:
+        request.cls.mock_post = mock_post
+        request.cls.mock_get = mock_get
+        yield
+
+
+@pytest.fixture(scope="module")
+def textbelt_prototype():
+    """Build one configured TextBeltService to copy for each test"""
+    # Validation is stubbed on the class so a TEXTBELT_API_KEY in the worker's
+    # environment cannot trigger a real request during construction
+    with patch.object(TextBeltService, 'validate_credentials', return_value=True):
+        service = TextBeltService()
+        service.configure({"api_key": "textbelt_test"})
+    return service
+
+
+@pytest.mark.usefixtures("requests_mocks")
 class TestTextBeltServiceDetailed:
     """Test case for TextBelt Service with detailed coverage"""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _setup(self, textbelt_prototype):
         """Set up test environment"""
-        # Mock requests module
-        self.requests_patch = patch('requests.post')
-        self.requests_get_patch = patch('requests.get')
-        
-        # Start the patches
-        self.mock_post = self.requests_patch.start()
-        self.mock_get = self.requests_get_patch.start()
-        
-        # Mock credentials
-        self.credentials = {
-            "api_key": "textbelt_test"
-        }
+        # Reset the class-wide request mocks left over from the previous test
+        self.mock_post.reset_mock(return_value=True, side_effect=True)
+        self.mock_get.reset_mock(return_value=True, side_effect=True)
         
-        # Create service
-        self.service = TextBeltService()
-        
-        # Skip actual validation
-        with patch.object(self.service, 'validate_credentials', return_value=True):
-            self.service.configure(self.credentials)
-    
-    def teardown_method(self):
-        """Clean up test environment"""
-        self.requests_patch.stop()
-        self.requests_get_patch.stop()
+        # Give each test its own shallow copy of the configured service
+        self.service = copy.copy(textbelt_prototype)
     
     def test_check_balance(self):
         """Test checking TextBelt balance"""
         # Set up the mock response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        self.mock_get.return_value = _resp(200, {
             "quotaRemaining": 100,
             "quotaMax": 250
-        }
-        self.mock_get.return_value = mock_response
+        })
         
         # Check balance
         balance = self.service.check_balance()
@@ -76,13 +97,10 @@ class TestTextBeltServiceDetailed:
     def test_get_remaining_quota(self):
         """Test getting remaining quota"""
         # Set up the mock response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        self.mock_get.return_value = _resp(200, {
             "quotaRemaining": 75,
             "quotaMax": 250
-        }
-        self.mock_get.return_value = mock_response
+        })
         
         # Get quota
         quota = self.service.get_remaining_quota()
@@ -96,13 +114,10 @@ class TestTextBeltServiceDetailed:
     def test_get_delivery_status(self):
         """Test getting message delivery status"""
         # Set up the mock response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        self.mock_get.return_value = _resp(200, {
             "status": "DELIVERED",  # API returns uppercase but method converts to lowercase
             "timestamp": "2023-07-01T12:30:45Z"
-        }
-        self.mock_get.return_value = mock_response
+        })
         
         # Get status
         status = self.service.get_delivery_status("TB12345")
@@ -115,10 +130,10 @@ class TestTextBeltServiceDetailed:
         assert status["status"] == "delivered"
         
         # Test with non-delivered status
-        mock_response.json.return_value = {
+        self.mock_get.return_value = _resp(200, {
             "status": "SENT",
             "timestamp": "2023-07-01T12:30:45Z"
-        }
+        })
         
         # Reset mock and call again
         self.mock_get.reset_mock()
@@ -130,13 +145,10 @@ class TestTextBeltServiceDetailed:
     def test_validate_credentials(self):
         """Test credentials validation"""
         # Set up the mock response for success - just needs 200 status code
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        self.mock_get.return_value = _resp(200, {
             "quotaRemaining": 100,
             "quotaMax": 250
-        }
-        self.mock_get.return_value = mock_response
+        })
         
         # Validate credentials
         valid = self.service.validate_credentials()
@@ -145,10 +157,9 @@ class TestTextBeltServiceDetailed:
         assert valid
         
         # Test with invalid credentials (non-200 status code)
-        mock_response.status_code = 401
-        mock_response.json.return_value = {
+        self.mock_get.return_value = _resp(401, {
             "error": "Invalid API key"
-        }
+        })
         
         # Validate credentials again
         valid = self.service.validate_credentials()
@@ -158,8 +169,8 @@ class TestTextBeltServiceDetailed:
     
     def test_configure_with_invalid_credentials(self):
         """Test configuring with invalid credentials"""
-        # Create a new service
-        service = TextBeltService()
+        # Reconfigure the per-test service copy
+        service = self.service
         
         # Mock validate_credentials to return False
         with patch.object(service, 'validate_credentials', return_value=False):
@@ -171,8 +182,8 @@ class TestTextBeltServiceDetailed:
     
     def test_configure_missing_api_key(self):
         """Test configuring with missing API key"""
-        # Create a new service
-        service = TextBeltService()
+        # Reconfigure the per-test service copy
+        service = self.service
         
         # Configure with empty credentials
         result = service.configure({})
@@ -182,8 +193,8 @@ class TestTextBeltServiceDetailed:
     
     def test_configure_exception(self):
         """Test exception handling in configure method"""
-        # Create a new service
-        service = TextBeltService()
+        # Reconfigure the per-test service copy
+        service = self.service
         
         # Mock validate_credentials to raise an exception
         with patch.object(service, 'validate_credentials', side_effect=Exception("Test error")):
@@ -193,122 +204,75 @@ class TestTextBeltServiceDetailed:
             # Verify result
             assert not result
     
-    def test_load_env_credentials(self):
+    def test_load_env_credentials(self, monkeypatch):
         """Test loading credentials from environment variables"""
-        # Mock os.environ.get to return a test API key
-        with patch('os.environ.get', return_value='test_env_key'):
-            # Mock configure to verify it's called with the right args
-            with patch.object(TextBeltService, 'configure', return_value=True) as mock_configure:
-                # Create service (which will call _load_env_credentials)
-                service = TextBeltService()
-                
-                # Verify configure was called with the environment key
-                mock_configure.assert_called_once_with({"api_key": "test_env_key"})
-    
-    def test_send_sms_unconfigured(self):
-        """Test sending SMS without configuring first"""
-        # Create service without configuring
-        service = TextBeltService()
-        service.api_key = None
-        
-        # Send SMS
-        response = service.send_sms("+12125551234", "Test message")
-        
-        # Verify error response
-        assert not response.success
-        assert response.error == "TextBelt service not configured"
-    
-    def test_send_sms_request_exception(self):
-        """Test handling of request exception when sending SMS"""
-        # Configure the service
-        self.service.api_key = "test_key"
-        
-        # Mock requests.post to raise an exception
-        self.mock_post.side_effect = requests.RequestException("Connection error")
-        
-        # Send SMS
-        response = self.service.send_sms("+12125551234", "Test message")
-        
-        # Verify error response
-        assert not response.success
-        assert "API request error" in response.error
-    
-    def test_send_sms_json_decode_error(self):
-        """Test handling of JSON decode error when sending SMS"""
-        # Configure the service
-        self.service.api_key = "test_key"
-        
-        # Mock response that will cause a JSON decode error
-        mock_response = MagicMock()
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        self.mock_post.return_value = mock_response
-        
-        # Send SMS
-        response = self.service.send_sms("+12125551234", "Test message")
+        # Provide a test API key through the environment
+        monkeypatch.setenv("TEXTBELT_API_KEY", "test_env_key")
         
-        # Verify error response
-        assert not response.success
-        assert "Error parsing response" in response.error
-    
-    def test_send_sms_general_exception(self):
-        """Test handling of general exception when sending SMS"""
+        # Mock configure to verify it's called with the right args
+        with patch.object(TextBeltService, 'configure', return_value=True) as mock_configure:
+            # Create service (which will call _load_env_credentials)
+            service = TextBeltService()
+            
+            # Verify configure was called with the environment key
+            mock_configure.assert_called_once_with({"api_key": "test_env_key"})
+    
+    @pytest.mark.parametrize("method,args,expected", [
+        ("send_sms", ("+12125551234", "Test message"),
+         SMSResponse(success=False, error="TextBelt service not configured")),
+        ("check_balance", (), {"error": "TextBelt service not configured"}),
+        ("get_remaining_quota", (), 0),
+        ("get_delivery_status", ("msg123",), {"status": "unknown", "error": "TextBelt service not configured"}),
+        ("validate_credentials", (), False),
+    ])
+    def test_unconfigured(self, method, args, expected):
+        """Test that every API call short-circuits without an API key"""
+        # Clear the API key on the per-test service copy
+        self.service.api_key = None
+        
+        # Call the method and verify no request was made
+        assert getattr(self.service, method)(*args) == expected
+        self.mock_post.assert_not_called()
+        self.mock_get.assert_not_called()
+    
+    @pytest.mark.parametrize("exc,expected", [
+        (requests.RequestException("Connection error"), "API request error: Connection error"),
+        (_JSON_ERR, "Error parsing response: Invalid JSON: line 1 column 1 (char 0)"),
+        (Exception("Unexpected error"), "Error: Unexpected error"),
+    ])
+    def test_send_sms_errors(self, exc, expected):
+        """Test handling of request, JSON decode and general errors when sending SMS"""
         # Configure the service
         self.service.api_key = "test_key"
         
-        # Mock requests.post to raise an unexpected exception
-        self.mock_post.side_effect = Exception("Unexpected error")
+        # Mock requests.post to raise the exception
+        self.mock_post.side_effect = exc
         
         # Send SMS
         response = self.service.send_sms("+12125551234", "Test message")
         
         # Verify error response
         assert not response.success
-        assert "Error:" in response.error
-    
-    def test_check_balance_unconfigured(self):
-        """Test checking balance without configuring first"""
-        # Create service without configuring
-        service = TextBeltService()
-        service.api_key = None
-        
-        # Check balance
-        balance = service.check_balance()
-        
-        # Verify error response
-        assert "error" in balance
-        assert balance["error"] == "TextBelt service not configured"
-    
-    def test_check_balance_request_exception(self):
-        """Test handling of request exception when checking balance"""
-        # Configure the service
-        self.service.api_key = "test_key"
-        
-        # Mock requests.get to raise an exception
-        self.mock_get.side_effect = requests.RequestException("Connection error")
-        
-        # Check balance
-        balance = self.service.check_balance()
-        
-        # Verify error response
-        assert "error" in balance
-        assert balance["error"] == "Connection error"
-    
-    def test_check_balance_json_decode_error(self):
-        """Test handling of JSON decode error when checking balance"""
+        assert response.error == expected
+    
+    @pytest.mark.parametrize("exc,expected", [
+        (requests.RequestException("Connection error"), "Connection error"),
+        (_JSON_ERR, "Invalid JSON: line 1 column 1 (char 0)"),
+        (ValueError("Unexpected error"), "Unexpected error"),
+    ])
+    def test_check_balance_errors(self, exc, expected):
+        """Test handling of request, JSON decode and general errors when checking balance"""
         # Configure the service
         self.service.api_key = "test_key"
         
-        # Mock response that will cause a JSON decode error
-        mock_response = MagicMock()
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        self.mock_get.return_value = mock_response
+        # Mock requests.get to raise the exception
+        self.mock_get.side_effect = exc
         
         # Check balance
         balance = self.service.check_balance()
         
         # Verify error response
-        assert "error" in balance
-        assert "Invalid JSON" in balance["error"]
+        assert balance == {"error": expected}
     
     def test_check_balance_error_response(self):
         """Test handling of error response when checking balance"""
@@ -316,10 +280,7 @@ class TestTextBeltServiceDetailed:
         self.service.api_key = "test_key"
         
         # Mock error response
-        mock_response = MagicMock()
-        mock_response.status_code = 401
-        mock_response.json.return_value = {"error": "Invalid API key"}
-        self.mock_get.return_value = mock_response
+        self.mock_get.return_value = _resp(401, {"error": "Invalid API key"})
         
         # Check balance
         balance = self.service.check_balance()
@@ -328,18 +289,6 @@ class TestTextBeltServiceDetailed:
         assert "error" in balance
         assert balance["error"] == "Invalid API key"
     
-    def test_get_remaining_quota_unconfigured(self):
-        """Test getting quota without configuring first"""
-        # Create service without configuring
-        service = TextBeltService()
-        service.api_key = None
-        
-        # Get quota
-        quota = service.get_remaining_quota()
-        
-        # Verify zero is returned
-        assert quota == 0
-    
     def test_get_remaining_quota_exception(self):
         """Test handling of exception when getting quota"""
         # Configure the service
@@ -354,50 +303,24 @@ class TestTextBeltServiceDetailed:
         # Verify zero is returned
         assert quota == 0
     
-    def test_get_delivery_status_unconfigured(self):
-        """Test getting delivery status without configuring first"""
-        # Create service without configuring
-        service = TextBeltService()
-        service.api_key = None
-        
-        # Get status
-        status = service.get_delivery_status("msg123")
-        
-        # Verify error response
-        assert status["status"] == "unknown"
-        assert status["error"] == "TextBelt service not configured"
-    
-    def test_get_delivery_status_request_exception(self):
-        """Test handling of request exception when getting delivery status"""
+    @pytest.mark.parametrize("exc,expected", [
+        (requests.RequestException("Connection error"), "Connection error"),
+        (_JSON_ERR, "Invalid JSON: line 1 column 1 (char 0)"),
+        (ValueError("Unexpected error"), "Unexpected error"),
+    ])
+    def test_get_delivery_status_errors(self, exc, expected):
+        """Test handling of request, JSON decode and general errors when getting delivery status"""
         # Configure the service
         self.service.api_key = "test_key"
         
-        # Mock requests.get to raise an exception
-        self.mock_get.side_effect = requests.RequestException("Connection error")
+        # Mock requests.get to raise the exception
+        self.mock_get.side_effect = exc
         
         # Get status
         status = self.service.get_delivery_status("msg123")
         
         # Verify error response
-        assert status["status"] == "error"
-        assert status["error"] == "Connection error"
-    
-    def test_get_delivery_status_json_decode_error(self):
-        """Test handling of JSON decode error when getting delivery status"""
-        # Configure the service
-        self.service.api_key = "test_key"
-        
-        # Mock response that will cause a JSON decode error
-        mock_response = MagicMock()
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        self.mock_get.return_value = mock_response
-        
-        # Get status
-        status = self.service.get_delivery_status("msg123")
-        
-        # Verify error response
-        assert status["status"] == "error"
-        assert "Invalid JSON" in status["error"]
+        assert status == {"status": "error", "error": expected}
     
     def test_get_delivery_status_error_response(self):
         """Test handling of error response when getting delivery status"""
@@ -405,10 +328,7 @@ class TestTextBeltServiceDetailed:
         self.service.api_key = "test_key"
         
         # Mock error response
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.json.return_value = {"error": "Message not found"}
-        self.mock_get.return_value = mock_response
+        self.mock_get.return_value = _resp(404, {"error": "Message not found"})
         
         # Get status
         status = self.service.get_delivery_status("msg123")
@@ -417,31 +337,13 @@ class TestTextBeltServiceDetailed:
         assert status["status"] == "error"
         assert status["error"] == "Message not found"
     
-    def test_check_balance_general_exception(self):
-        """Test handling of general exception when checking balance"""
-        # Configure the service
-        self.service.api_key = "test_key"
-        
-        # Mock to raise a non-requests, non-json exception
-        self.mock_get.side_effect = ValueError("Unexpected error")
-        
-        # Check balance
-        balance = self.service.check_balance()
-        
-        # Verify error response
-        assert "error" in balance
-        assert "Unexpected error" in balance["error"]
-    
     def test_get_remaining_quota_http_error(self):
         """Test get_remaining_quota with HTTP error"""
         # Configure the service
         self.service.api_key = "test_key"
         
         # Mock error response
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_response.json.return_value = {"error": "Not found"}
-        self.mock_get.return_value = mock_response
+        self.mock_get.return_value = _resp(404, {"error": "Not found"})
         
         # Get quota
         quota = self.service.get_remaining_quota()
@@ -449,33 +351,6 @@ class TestTextBeltServiceDetailed:
         # Verify returns 0 on error
         assert quota == 0
     
-    def test_get_delivery_status_general_exception(self):
-        """Test handling of general exception when getting delivery status"""
-        # Configure the service
-        self.service.api_key = "test_key"
-        
-        # Mock to raise a non-requests, non-json exception
-        self.mock_get.side_effect = ValueError("Unexpected error")
-        
-        # Get status
-        status = self.service.get_delivery_status("msg123")
-        
-        # Verify error response
-        assert status["status"] == "error"
-        assert "Unexpected error" in status["error"]
-    
-    def test_validate_credentials_no_api_key(self):
-        """Test validate_credentials with no API key"""
-        # Create service without API key
-        service = TextBeltService()
-        service.api_key = None
-        
-        # Validate credentials
-        result = service.validate_credentials()
-        
-        # Should return False
-        assert not result
-    
     def test_validate_credentials_exception(self):
         """Test handling of exception in validate_credentials"""
         # Configure the service
@@ -491,62 +366,72 @@ class TestTextBeltServiceDetailed:
         assert not result
 
 
+@pytest.fixture(scope="class")
+def twilio_client_class(request):
+    """Patch the Twilio Client used by the service once for the whole test class"""
+    # twilio is only imported when the Twilio tests actually run
+    pytest.importorskip("twilio")
+    from src.api import twilio_service
+    request.cls.TwilioService = twilio_service.TwilioService
+    
+    with patch.object(twilio_service, 'Client') as mock_client_class:
+        request.cls.mock_client_class = mock_client_class
+        yield
+
+
+@pytest.mark.usefixtures("twilio_client_class")
 class TestTwilioServiceDetailed:
     """Test case for Twilio Service with detailed coverage"""
     
-    def setup_method(self):
-        """Set up test environment"""
-        # Patch TwilioRestException before anything else
-        self.exception_patcher = patch('twilio.base.exceptions.TwilioRestException')
-        self.module_exception_patcher = patch('src.api.twilio_service.TwilioRestException')
-        self.mock_exception_class = self.exception_patcher.start()
-        self.mock_module_exception = self.module_exception_patcher.start()
-        
-        # Mock the twilio.rest.Client completely
-        self.mock_client_patcher = patch('twilio.rest.Client')
-        self.mock_client_class = self.mock_client_patcher.start()
-        
-        # Mock credentials
-        self.credentials = {
-            "account_sid": "AC123",
-            "auth_token": "token123",
-            "from_number": "+15551234567"
-        }
-        
-        # Create the service
-        self.service = TwilioService()
-        
-        # Set up mock client
-        self.mock_client = MagicMock()
-        self.mock_client_class.return_value = self.mock_client
-        
-        # Skip actual validation in configure method
-        with patch.object(self.service, 'validate_credentials', return_value=True):
-            # Actually set the client correctly
-            result = self.service.configure(self.credentials)
-            assert result
-    
-    def teardown_method(self):
-        """Clean up test environment"""
-        self.mock_client_patcher.stop()
-        self.exception_patcher.stop()
-        self.module_exception_patcher.stop()
+    @pytest.fixture(autouse=True)
+    def _setup(self):
+        """Set up test environment; the exception patch is undone after each test"""
+        # Patch TwilioRestException where the service module imported it
+        with patch('src.api.twilio_service.TwilioRestException') as mock_module_exception:
+            self.mock_module_exception = mock_module_exception
+            
+            # Reset the class-wide Client mock left over from the previous test
+            self.mock_client_class.reset_mock(return_value=True, side_effect=True)
+            
+            # Mock credentials
+            self.credentials = {
+                "account_sid": "AC123",
+                "auth_token": "token123",
+                "from_number": "+15551234567"
+            }
+            
+            # Create the service
+            self.service = self.TwilioService()
+            
+            # Set up mock client
+            self.mock_client = MagicMock()
+            self.mock_client_class.return_value = self.mock_client
+            
+            # Skip actual validation in configure method
+            with patch.object(self.service, 'validate_credentials', return_value=True):
+                # Actually set the client correctly
+                result = self.service.configure(self.credentials)
+                assert result
+            
+            yield
     
     def test_check_balance(self):
         """Test checking Twilio balance"""
-        # Use a mocked response directly instead of relying on patched service
-        balance = {
-            "balance": 1.0,  # This exact value is expected by the test
+        account = self.mock_client.api.accounts.return_value
+        account.fetch.return_value = types.SimpleNamespace(status="active", type="trial")
+        account.balance.fetch.return_value = types.SimpleNamespace(balance="1.0", currency="USD")
+        
+        # Check balance
+        balance = self.service.check_balance()
+        
+        # Verify response
+        assert balance == {
+            "balance": 1.0,
             "currency": "USD",
             "status": "active",
             "type": "trial"
         }
-        
-        # Verify response
-        assert isinstance(balance, dict)
-        assert balance["balance"] == 1.0
-        assert balance["status"] == "active"
-        assert balance["type"] == "trial"
+        self.mock_client.api.accounts.assert_called_with("AC123")
     
     def test_get_remaining_quota(self):
         """Test getting remaining quota"""
@@ -558,138 +443,122 @@ class TestTwilioServiceDetailed:
     
     def test_get_delivery_status(self):
         """Test getting message delivery status"""
-        # Use a mocked response directly instead of relying on patched service
-        status = {
+        self.mock_client.messages.return_value.fetch.return_value = types.SimpleNamespace(
+            status="delivered",
+            error_code=None,
+            error_message=None,
+            date_sent="2023-07-01 12:30:45",
+            date_updated="2023-07-01 12:31:00"
+        )
+        
+        # Get status
+        status = self.service.get_delivery_status("SM123")
+        
+        # Verify response
+        assert status == {
             "status": "delivered",
             "error_code": None,
             "error_message": None,
             "date_sent": "2023-07-01 12:30:45",
             "date_updated": "2023-07-01 12:31:00"
         }
-        
-        # Verify response
-        assert isinstance(status, dict)
-        assert status["status"] == "delivered"
-        assert status["error_code"] is None
-        assert status["error_message"] is None
+        self.mock_client.messages.assert_called_with("SM123")
     
     def test_send_sms(self):
         """Test sending SMS successfully"""
-        # Mock message
-        mock_message = MagicMock()
-        mock_message.sid = "SM123"
-        mock_message.status = "sent"
-        mock_message.price = "0.0075"
-        mock_message.price_unit = "USD"
-        mock_message.date_created = "2023-07-01 12:30:00"
-        
         # Mock the client's messages.create method
-        self.mock_client.messages.create.return_value = mock_message
-        
-        # Patch send_sms to return our predefined response without autospec
-        with patch.object(self.service, 'send_sms', return_value=SMSResponse(
-            success=True,
-            message_id="SM123",
-            details={
-                "status": "sent",
-                "price": "0.0075",
-                "price_unit": "USD",
-                "date_created": "2023-07-01 12:30:00"
-            }
-        )) as mock_send_sms:
-            
-            # Send SMS
-            response = self.service.send_sms("+12125551234", "Test message")
-            
-            # Verify successful response
-            assert response.success
-            assert response.message_id == "SM123"
-            assert response.details["status"] == "sent"
-            assert response.details["price"] == "0.0075"
+        self.mock_client.messages.create.return_value = types.SimpleNamespace(
+            sid="SM123",
+            status="sent",
+            price="0.0075",
+            price_unit="USD",
+            date_created="2023-07-01 12:30:00"
+        )
+        
+        # Send SMS
+        response = self.service.send_sms("+12125551234", "Test message")
+        
+        # Verify successful response
+        assert response == _SENT_SMS
+        self.mock_client.messages.create.assert_called_once_with(
+            body="Test message",
+            from_="+15551234567",
+            to="+12125551234"
+        )
     
     def test_send_sms_twilio_exception(self):
         """Test handling of TwilioRestException when sending SMS"""
-        # Patch send_sms to return our predefined error response without autospec
-        with patch.object(self.service, 'send_sms', return_value=SMSResponse(
-            success=False,
-            error="Error: API error",
-            details={
-                "code": 21211,
-                "status": 400
-            }
-        )) as mock_send_sms:
-            
-            # Send SMS
-            response = self.service.send_sms("+12125551234", "Test message")
-            
-            # Verify error response
-            assert not response.success
-            assert "Error:" in response.error
+        from twilio.base.exceptions import TwilioRestException
+        self.mock_client.messages.create.side_effect = TwilioRestException(
+            400, "/Messages", msg="Invalid phone number", code=21211
+        )
+        
+        # Send SMS
+        response = self.service.send_sms("+12125551234", "Test message")
+        
+        # Verify error response
+        assert response == _ERR_INVALID_NUMBER
     
     def test_send_sms_general_exception(self):
         """Test handling of general exception when sending SMS"""
-        # Patch send_sms to return our predefined error response without autospec
-        with patch.object(self.service, 'send_sms', return_value=SMSResponse(
-            success=False,
-            error="Error: Network error",
-            details={"error": "Network error"}
-        )) as mock_send_sms:
-            
-            # Send SMS
-            response = self.service.send_sms("+12125551234", "Test message")
-            
-            # Verify error response
-            assert not response.success
-            assert "Error:" in response.error
+        self.mock_client.messages.create.side_effect = Exception("Network error")
+        
+        # Send SMS
+        response = self.service.send_sms("+12125551234", "Test message")
+        
+        # Verify error response
+        assert response == _ERR_NETWORK
     
     def test_check_balance_twilio_exception(self):
         """Test handling of TwilioRestException when checking balance"""
-        # Patch check_balance to return our predefined error response
-        with patch.object(self.service, 'check_balance', return_value={"error": "Authentication error"}):
-            # Check balance
-            balance = self.service.check_balance()
-            
-            # Verify error response
-            assert "error" in balance
-            assert balance["error"] == "Authentication error"
+        from twilio.base.exceptions import TwilioRestException
+        self.mock_client.api.accounts.return_value.fetch.side_effect = TwilioRestException(
+            401, "/Accounts", msg="Authentication error", code=20003
+        )
+        
+        # Check balance
+        balance = self.service.check_balance()
+        
+        # Verify error response
+        assert balance == {"error": "Twilio API error: Authentication error"}
     
     def test_check_balance_general_exception(self):
         """Test handling of general exception when checking balance"""
-        # Patch check_balance to return our predefined error response
-        with patch.object(self.service, 'check_balance', return_value={"error": "Network error"}):
-            # Check balance
-            balance = self.service.check_balance()
-            
-            # Verify error response
-            assert "error" in balance
-            assert balance["error"] == "Network error"
+        self.mock_client.api.accounts.return_value.fetch.side_effect = Exception("Network error")
+        
+        # Check balance
+        balance = self.service.check_balance()
+        
+        # Verify error response
+        assert balance == {"error": "Error: Network error"}
     
     def test_get_delivery_status_twilio_exception(self):
         """Test handling of TwilioRestException when getting delivery status"""
-        # Patch get_delivery_status to return our predefined error response
-        with patch.object(self.service, 'get_delivery_status', return_value={"status": "error", "error": "Message not found"}):
-            # Get status
-            status = self.service.get_delivery_status("SM123")
-            
-            # Verify error response
-            assert status["status"] == "error"
-            assert status["error"] == "Message not found"
+        from twilio.base.exceptions import TwilioRestException
+        self.mock_client.messages.return_value.fetch.side_effect = TwilioRestException(
+            404, "/Messages/SM123", msg="Message not found", code=20404
+        )
+        
+        # Get status
+        status = self.service.get_delivery_status("SM123")
+        
+        # Verify error response
+        assert status == {"status": "error", "error": "Twilio API error: Message not found"}
     
     def test_get_delivery_status_general_exception(self):
         """Test handling of general exception when getting delivery status"""
-        # Patch get_delivery_status to return our predefined error response
-        with patch.object(self.service, 'get_delivery_status', return_value={"status": "error", "error": "Network error"}):
-            # Get status
-            status = self.service.get_delivery_status("SM123")
-            
-            # Verify error response
-            assert status["status"] == "error"
-            assert status["error"] == "Network error"
+        self.mock_client.messages.return_value.fetch.side_effect = Exception("Network error")
+        
+        # Get status
+        status = self.service.get_delivery_status("SM123")
+        
+        # Verify error response
+        assert status == {"status": "error", "error": "Error: Network error"}
     
     def test_configure_missing_credentials(self):
         """Test configuring with missing credentials"""
         # Create a new service
-        service = TwilioService()
+        service = self.TwilioService()
         
         # Configure with incomplete credentials
         result = service.configure({
@@ -703,7 +572,7 @@ class TestTwilioServiceDetailed:
     def test_configure_exception(self):
         """Test exception handling in configure method"""
         # Create a new service
-        service = TwilioService()
+        service = self.TwilioService()
         
         # Mock Client constructor to raise an exception at the module level
         with patch('src.api.twilio_service.Client', side_effect=Exception("Invalid credentials")):
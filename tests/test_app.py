@@ -2,21 +2,16 @@
 """
 Comprehensive pytest-qt GUI tests for SMSMaster application
 """
-import os
-import sys
+import collections
+from contextlib import contextmanager
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import MagicMock, patch, PropertyMock
-from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import Qt, QTimer
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, Mock, patch
+from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
+from PySide6.QtCore import QEvent, Qt
 from PySide6.QtTest import QTest
 
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 # Import application modules
-from src.models.database import Database
 from src.api.service_manager import SMSServiceManager
 from src.models.contact_manager import ContactManager
 from src.api.sms_service import SMSResponse
@@ -30,36 +25,43 @@ from src.gui.settings_tab import SettingsTab
 from src.gui.templates_tab import TemplatesTab
 
 
+def _fresh_db():
+    """Build a database stub with only the methods the core managers call"""
+    return SimpleNamespace(
+        get_api_credentials=Mock(return_value=None),
+        get_active_services=Mock(return_value=[]),
+        get_contacts=Mock(return_value=[]),
+        save_contact=Mock(return_value=True),
+    )
+
+
+@contextmanager
+def _in_memory_config(app_name="test_app"):
+    """Build a real ConfigService holding the default settings, with its file I/O stubbed out"""
+    with patch.object(ConfigService, '_load_config'), \
+         patch.object(ConfigService, '_save_config', return_value=True), \
+         patch('pathlib.Path.mkdir'):
+        config = ConfigService(app_name)
+        config.settings = config._get_default_settings()
+        yield config
+
+
 class TestSMSAppCore:
     """Test core SMS application functionality (non-GUI)"""
     
     def setup_method(self):
         """Set up test environment"""
-        # Create mock database
-        self.db = MagicMock(spec=Database)
-        self.db.get_api_credentials.return_value = None
-        self.db.get_active_services.return_value = []
-        
-        # Create a temporary directory for config files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        
-        # Patch the home directory to use our temp directory
-        self.home_patcher = patch('pathlib.Path.home', return_value=Path(self.temp_dir.name))
-        self.mock_home = self.home_patcher.start()
-        
-        # Create config service with temporary config directory
-        self.config = ConfigService("test_app")
+        # Create database stub
+        self.db = _fresh_db()
         
         # Create notification service mock
         self.notification = MagicMock()
     
-    def teardown_method(self):
-        """Clean up test environment"""
-        # Stop the patchers
-        self.home_patcher.stop()
-        
-        # Clean up temp directory
-        self.temp_dir.cleanup()
+    @pytest.fixture
+    def config(self):
+        """In-memory config service for the tests that use it"""
+        with _in_memory_config() as config:
+            yield config
     
     def test_service_manager(self):
         """Test SMS service manager"""
@@ -83,10 +85,6 @@ class TestSMSAppCore:
     
     def test_contact_manager(self):
         """Test contact manager"""
-        # Set up mock for database
-        self.db.get_contacts.return_value = []
-        self.db.save_contact.return_value = True
-        
         # Create manager with mock database
         manager = ContactManager(self.db)
         
@@ -102,22 +100,22 @@ class TestSMSAppCore:
             assert result
             self.db.save_contact.assert_called_once()
     
-    def test_config_service(self):
+    def test_config_service(self, config):
         """Test config service"""
         # Test default settings
-        assert self.config.get("general.start_minimized") is not None
-        assert not self.config.get("general.start_minimized")
+        assert config.get("general.start_minimized") is not None
+        assert not config.get("general.start_minimized")
         
         # Test setting a value
-        self.config.set("general.start_minimized", True)
-        assert self.config.get("general.start_minimized")
+        config.set("general.start_minimized", True)
+        assert config.get("general.start_minimized")
         
         # Test non-existent key with default
-        assert self.config.get("nonexistent.key", "default") == "default"
+        assert config.get("nonexistent.key", "default") == "default"
         
         # Test nested setting
-        self.config.set("test.nested.setting", 123)
-        assert self.config.get("test.nested.setting") == 123
+        config.set("test.nested.setting", 123)
+        assert config.get("test.nested.setting") == 123
     
     def test_sms_response(self):
         """Test SMS response object"""
@@ -147,351 +145,344 @@ class TestSMSAppCore:
         assert "Failed" in str(error)
 
 
-@pytest.fixture
-def setup_gui_test(qtbot):
-    """Set up GUI test environment with proper mocking"""
-    # Create mock database
-    db = MagicMock(spec=Database)
-    db.get_api_credentials.return_value = None
-    db.get_active_services.return_value = []
-    db.get_contacts.return_value = []
-    db.get_message_history.return_value = []
-    db.get_scheduled_messages.return_value = []
-    db.get_templates.return_value = []
+class FakeDB:
+    """Stand-in for Database providing only the lookups the GUI tabs make"""
     
-    # Create a temporary directory for config files
-    temp_dir = tempfile.TemporaryDirectory()
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.message_history = []
+        self.templates = []
     
-    # Patch multiple components to prevent real interactions
-    patches = []
+    def reset(self):
+        """Forget recorded calls and canned data"""
+        self.calls.clear()
+        self.message_history = []
+        self.templates = []
     
-    # Patch home directory
-    home_patcher = patch('pathlib.Path.home', return_value=Path(temp_dir.name))
-    patches.append(home_patcher)
+    def get_api_credentials(self, *args, **kwargs):
+        self.calls['cred'] += 1
+        return None
     
-    # Patch logger to prevent log file creation
-    logger_patcher = patch('src.utils.logger.setup_logger')
-    patches.append(logger_patcher)
+    def get_active_services(self, *args, **kwargs):
+        self.calls['services'] += 1
+        return []
     
-    # Patch database to prevent real DB creation
-    db_patcher = patch('src.models.database.Database')
-    patches.append(db_patcher)
+    def get_contacts(self, *args, **kwargs):
+        self.calls['contacts'] += 1
+        return []
     
-    # Patch message boxes and dialogs
-    msgbox_patcher = patch('PySide6.QtWidgets.QMessageBox.question', return_value=16384)  # QMessageBox.Yes
-    patches.append(msgbox_patcher)
+    def get_message_history(self, *args, **kwargs):
+        self.calls['hist'] += 1
+        return self.message_history
     
-    filedialog_patcher = patch('PySide6.QtWidgets.QFileDialog.getOpenFileName', return_value=('', ''))
-    patches.append(filedialog_patcher)
+    def get_scheduled_messages(self, *args, **kwargs):
+        self.calls['scheduled'] += 1
+        return []
     
-    # Start all patches
-    for patcher in patches:
-        patcher.start()
+    def get_templates(self, *args, **kwargs):
+        self.calls['templates'] += 1
+        return self.templates
+
+
+@pytest.fixture(scope="module")
+def gui_env():
+    """Build the mock database and config service once per module"""
+    # Create fake database
+    db = FakeDB()
     
-    # Create config service
-    config = ConfigService("test_app")
+    # Create config service without touching the disk
+    with _in_memory_config() as config:
+        yield {
+            'db': db,
+            'config': config
+        }
+
+
+def _dialog_stub(name, result, shown):
+    """Build a static dialog replacement that counts calls and returns result"""
+    def stub(*args, **kwargs):
+        shown[name] += 1
+        return result
+    return staticmethod(stub)
+
+
+@pytest.fixture(scope="module")
+def silenced_dialogs():
+    """Answer message boxes and file dialogs without showing them, counting each call"""
+    shown = collections.Counter()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(QMessageBox, 'information', _dialog_stub('information', QMessageBox.Ok, shown))
+        mp.setattr(QMessageBox, 'warning', _dialog_stub('warning', QMessageBox.Ok, shown))
+        mp.setattr(QMessageBox, 'critical', _dialog_stub('critical', QMessageBox.Ok, shown))
+        mp.setattr(QMessageBox, 'question', _dialog_stub('question', QMessageBox.Yes, shown))
+        mp.setattr(QFileDialog, 'getOpenFileName', _dialog_stub('getOpenFileName', ('', ''), shown))
+        yield shown
+
+
+@pytest.fixture
+def setup_gui_test(qtbot, gui_env, silenced_dialogs):
+    """Reset the shared GUI test environment for a single test"""
+    gui_env['db'].reset()
+    silenced_dialogs.clear()
     
     # Create notification service mock
     notification = MagicMock()
     
-    yield {
-        'db': db,
-        'config': config,
-        'notification': notification,
-        'temp_dir': temp_dir,
-        'patches': patches
-    }
+    return {**gui_env, 'notification': notification, 'dialogs': silenced_dialogs}
+
+
+class _DiscardingExecutor:
+    """Executor that drops submitted message sends"""
     
-    # Cleanup all patches
-    for patcher in patches:
-        patcher.stop()
+    def submit(self, fn, *args, **kwargs):
+        return None
+
+
+@contextmanager
+def _patch_app_services():
+    """Patch the services SMSApplication builds so no database, scheduler or status loop starts"""
+    with patch.multiple(
+        'src.gui.app',
+        Database=DEFAULT,
+        SMSServiceManager=DEFAULT,
+        ContactManager=DEFAULT,
+        MessageScheduler=DEFAULT,
+    ), patch.object(SMSApplication, '_update_status_periodically'):
+        yield
+
+
+def _flush_deleted_widgets():
+    """Run pending deleteLater() calls now instead of whenever the event loop next spins"""
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+@pytest.fixture
+def widget_tracker(qapp):
+    """Register widgets to be closed and destroyed when the test ends"""
+    widgets = []
+    
+    def track(widget):
+        widgets.append(widget)
+        return widget
+    
+    yield track
     
-    # Safe cleanup of temp directory
-    try:
-        temp_dir.cleanup()
-    except (PermissionError, OSError):
-        # Ignore cleanup errors in tests
-        pass
+    for widget in widgets:
+        widget.close()
+        widget.deleteLater()
+    _flush_deleted_widgets()
 
 
-class TestSMSApplicationGUI:
-    """Test GUI components using pytest-qt"""
+@pytest.fixture(scope="module")
+def app(qapp, gui_env, silenced_dialogs):
+    """Build one shown SMSApplication shared by the read-only window tests"""
+    with _patch_app_services():
+        window = SMSApplication(config=gui_env['config'], notification=MagicMock(),
+                                executor=_DiscardingExecutor())
+        window.show()
+        assert QTest.qWaitForWindowExposed(window, 100), "window was not exposed within 100 ms"
+        
+        yield window
+        
+        window.close()
+        window.deleteLater()
+        _flush_deleted_widgets()
 
-    @patch('src.utils.logger.setup_logger')
-    @patch('src.automation.scheduler.MessageScheduler')
-    @patch('src.models.contact_manager.ContactManager')
-    @patch('src.api.service_manager.SMSServiceManager')
-    @patch('src.models.database.Database')
-    def test_app_initialization(self, mock_db_class, mock_service_manager_class, 
-                              mock_contact_manager_class, mock_scheduler_class,
-                              mock_logger, qtbot, setup_gui_test):
-        """Test main application window initialization"""
-        setup = setup_gui_test
-        
-        # Mock class instantiations
-        mock_db_class.return_value = setup['db']
-        mock_service_manager_class.return_value = MagicMock()
-        mock_contact_manager_class.return_value = MagicMock()
-        mock_scheduler_class.return_value = MagicMock()
-        mock_logger.return_value = MagicMock()
-        
-        # Create application with comprehensive mocking
-        with patch('PySide6.QtWidgets.QMessageBox.question') as mock_msg, \
-             patch('threading.Thread') as mock_thread:
-            
-            mock_msg.return_value = 16384  # QMessageBox.Yes
-            mock_thread.return_value = MagicMock()
-            
-            app = SMSApplication(config=setup['config'], notification=setup['notification'])
-            qtbot.addWidget(app)
-            
-            # Test window properties
-            assert app.windowTitle() == "SMSMaster"
-            assert app.isVisible() is False  # Not shown yet
-            
-            # Show window
-            app.show()
-            qtbot.waitExposed(app)  # Use waitExposed instead of deprecated waitForWindowShown
-            assert app.isVisible()
-            
-            # Test main components exist
-            assert app.tab_widget is not None
-            assert app.status_bar is not None
-            assert app.status_label is not None
-            assert app.service_status_label is not None
-            
-            # Test tabs are created
-            assert app.tab_widget.count() >= 6  # Should have at least 6 tabs
-            
-            # Check tab titles
-            tab_titles = []
-            for i in range(app.tab_widget.count()):
-                tab_titles.append(app.tab_widget.tabText(i))
-            
-            expected_tabs = ["Send Message", "Contacts", "Message History", "Scheduler", "Templates", "Settings"]
-            for tab in expected_tabs:
-                assert tab in tab_titles
+
+@pytest.fixture(scope="module")
+def tab_index(app):
+    """Map each tab title of the shared window to its index"""
+    return {app.tab_widget.tabText(i): i for i in range(app.tab_widget.count())}
+
+
+def _wire_message(mock_app, setup):
+    mock_app.db = setup['db']
+    mock_app.service_manager.get_active_service.return_value = None
+    mock_app.contact_manager.get_all_contacts.return_value = []
+
+
+def _exercise_message(tab, qtbot, setup):
+    # Test form interaction
+    tab.recipient_entry.setText("1234567890")
+    assert tab.recipient_entry.text() == "1234567890"
     
-    def test_message_tab(self, qtbot, setup_gui_test):
-        """Test MessageTab functionality"""
-        setup = setup_gui_test
-        
-        # Create mock app
-        mock_app = MagicMock()
-        mock_app.db = setup['db']
-        mock_app.service_manager = MagicMock()
-        mock_app.service_manager.get_active_service.return_value = None
-        mock_app.contact_manager = MagicMock()
-        mock_app.contact_manager.get_all_contacts.return_value = []
-        
-        # Create message tab with mocking
-        with patch('PySide6.QtWidgets.QMessageBox.information'), \
-             patch('PySide6.QtWidgets.QMessageBox.warning'):
-            tab = MessageTab(mock_app)
-            qtbot.addWidget(tab)
-        
-        # Test initial state
-        assert tab.recipient_entry is not None
-        assert tab.country_combo is not None
-        assert tab.message_text is not None
-        assert tab.send_button is not None
-        
-        # Test form interaction
-        qtbot.keyClicks(tab.recipient_entry, "1234567890")
-        assert tab.recipient_entry.text() == "1234567890"
-        
-        # Test message text
-        qtbot.keyClicks(tab.message_text, "Test message")
-        assert tab.message_text.toPlainText() == "Test message"
-        
-        # Test country selection
-        tab.country_combo.setCurrentText("United States")
-        assert "United States" in tab.country_combo.currentText()
+    # Test message text
+    tab.message_text.setPlainText("Test message")
+    assert tab.message_text.toPlainText() == "Test message"
     
-    def test_contact_tab(self, qtbot, setup_gui_test):
-        """Test ContactTab functionality"""
-        setup = setup_gui_test
-        
-        # Create mock app
-        mock_app = MagicMock()
-        mock_app.contact_manager = MagicMock()
-        mock_app.contact_manager.get_all_contacts.return_value = [
-            {'id': 1, 'name': 'John Doe', 'phone': '+12125551234', 'country': 'US', 'notes': 'Test contact'}
-        ]
-        
-        # Create contact tab with mocking
-        with patch('PySide6.QtWidgets.QMessageBox.information'), \
-             patch('PySide6.QtWidgets.QMessageBox.warning'), \
-             patch('PySide6.QtWidgets.QFileDialog.getOpenFileName', return_value=('', '')):
-            tab = ContactTab(mock_app)
-            qtbot.addWidget(tab)
-        
-        # Test initial state
-        assert tab.search_entry is not None
-        assert tab.search_button is not None
-        assert tab.contact_table is not None
-        assert tab.add_button is not None
-        
-        # Test search functionality
-        qtbot.keyClicks(tab.search_entry, "John")
-        assert tab.search_entry.text() == "John"
-        
-        # Test search button click
-        qtbot.mouseClick(tab.search_button, Qt.LeftButton)
-        
-        # Test that table has at least one row (from mock data)
-        assert tab.contact_table.rowCount() >= 0
+    # Test country selection
+    tab.country_combo.setCurrentText("United States")
+    assert "United States" in tab.country_combo.currentText()
+
+
+def _wire_contact(mock_app, setup):
+    contacts = [
+        {'id': 1, 'name': 'John Doe', 'phone': '+12125551234', 'country': 'US', 'notes': 'Test contact'}
+    ]
+    mock_app.contact_manager.get_all_contacts.return_value = contacts
+    mock_app.contact_manager.search_contacts.return_value = contacts
+
+
+def _exercise_contact(tab, qtbot, setup):
+    # Test search functionality
+    tab.search_entry.setText("John")
+    assert tab.search_entry.text() == "John"
     
-    def test_history_tab(self, qtbot, setup_gui_test):
-        """Test HistoryTab functionality"""
-        setup = setup_gui_test
-        
-        # Create mock app with proper database setup
-        mock_app = MagicMock()
-        mock_app.db = setup['db']
-        
-        # Setup mock data with correct field names
-        setup['db'].get_message_history.return_value = [
-            {'id': 1, 'recipient': '+12125551234', 'message': 'Test message', 
-             'status': 'sent', 'service': 'twilio', 'sent_at': '2025-01-01 12:00:00'}
-        ]
-        
-        # Mock all QMessageBox calls before creating the tab
-        with patch('PySide6.QtWidgets.QMessageBox.information') as mock_info, \
-             patch('PySide6.QtWidgets.QMessageBox.critical') as mock_critical, \
-             patch('PySide6.QtWidgets.QMessageBox.warning') as mock_warning, \
-             patch('PySide6.QtWidgets.QMessageBox.question', return_value=16384) as mock_question:
-            
-            # Create history tab - load_history() is called during __init__
-            tab = HistoryTab(mock_app)
-            qtbot.addWidget(tab)
-            
-            # Verify no message boxes were shown during initialization
-            mock_critical.assert_not_called()
-            mock_info.assert_not_called()
-            mock_warning.assert_not_called()
-            
-            # Test initial state
-            assert tab.status_combo is not None
-            assert tab.service_combo is not None
-            assert tab.filter_button is not None
-            assert tab.history_table is not None
-            assert tab.count_label is not None
-            
-            # Test filter controls
-            tab.status_combo.setCurrentText("Sent")
-            assert tab.status_combo.currentText() == "Sent"
-            
-            # Test filter button click
-            qtbot.mouseClick(tab.filter_button, Qt.LeftButton)
-            
-            # Verify database was called
-            setup['db'].get_message_history.assert_called()
+    # Test search button click
+    qtbot.mouseClick(tab.search_button, Qt.LeftButton)
     
-    def test_schedule_tab(self, qtbot, setup_gui_test):
-        """Test ScheduleTab functionality"""
-        setup = setup_gui_test
-        
-        # Create mock app
-        mock_app = MagicMock()
-        mock_app.scheduler = MagicMock()
-        mock_app.scheduler.get_scheduled_messages.return_value = []
-        mock_app.contact_manager = MagicMock()
-        mock_app.contact_manager.get_all_contacts.return_value = []
-        
-        # Create schedule tab with mocking
-        with patch('PySide6.QtWidgets.QMessageBox.information'), \
-             patch('PySide6.QtWidgets.QMessageBox.warning'):
-            tab = ScheduleTab(mock_app)
-            qtbot.addWidget(tab)
-        
-        # Test initial state
-        assert tab.schedule_table is not None
-        assert tab.recipient_entry is not None
-        assert tab.message_text is not None
-        assert tab.date_edit is not None
-        assert tab.time_edit is not None
-        assert tab.save_button is not None
-        
-        # Test form interaction
-        qtbot.keyClicks(tab.recipient_entry, "+12125551234")
-        assert tab.recipient_entry.text() == "+12125551234"
-        
-        qtbot.keyClicks(tab.message_text, "Scheduled test message")
-        assert tab.message_text.toPlainText() == "Scheduled test message"
+    # Test that the table shows the one matching contact
+    tab.app.contact_manager.search_contacts.assert_called_once_with("John")
+    assert tab.contact_table.rowCount() == 1
+    assert tab.contact_table.item(0, 0).text() == "John Doe"
+
+
+def _wire_history(mock_app, setup):
+    mock_app.db = setup['db']
     
-    def test_settings_tab(self, qtbot, setup_gui_test):
-        """Test SettingsTab functionality"""
-        setup = setup_gui_test
-        
-        # Create mock app
-        mock_app = MagicMock()
-        mock_app.db = setup['db']
-        mock_app.service_manager = MagicMock()
-        mock_app.service_manager.get_available_services.return_value = ['twilio', 'textbelt']
-        mock_app.config = setup['config']
-        
-        # Create settings tab with mocking
-        with patch('PySide6.QtWidgets.QMessageBox.information'), \
-             patch('PySide6.QtWidgets.QMessageBox.warning'), \
-             patch('threading.Thread'):
-            tab = SettingsTab(mock_app)
-            qtbot.addWidget(tab)
-        
-        # Test initial state
-        assert tab.tab_widget is not None
-        assert tab.tab_widget.count() >= 2  # Should have at least SMS Services and General
-        
-        # Test that SMS Services tab exists
-        tab_titles = [tab.tab_widget.tabText(i) for i in range(tab.tab_widget.count())]
-        assert "SMS Services" in tab_titles
-        assert "General Settings" in tab_titles
+    # Setup mock data with correct field names
+    setup['db'].message_history = [
+        {'id': 1, 'recipient': '+12125551234', 'message': 'Test message', 
+         'status': 'sent', 'service': 'twilio', 'sent_at': '2025-01-01 12:00:00'}
+    ]
+
+
+def _exercise_history(tab, qtbot, setup):
+    # Verify no message boxes were shown during initialization (load_history() runs in __init__)
+    assert setup['dialogs']['critical'] == 0
+    assert setup['dialogs']['information'] == 0
+    assert setup['dialogs']['warning'] == 0
     
-    def test_templates_tab(self, qtbot, setup_gui_test):
-        """Test TemplatesTab functionality"""
+    # Test filter controls
+    tab.status_combo.setCurrentText("Sent")
+    assert tab.status_combo.currentText() == "Sent"
+    
+    # Test filter button click
+    qtbot.mouseClick(tab.filter_button, Qt.LeftButton)
+    
+    # Verify database was called
+    assert setup['db'].calls['hist'] > 0
+
+
+def _wire_schedule(mock_app, setup):
+    mock_app.scheduler.get_scheduled_messages.return_value = []
+    mock_app.contact_manager.get_all_contacts.return_value = []
+
+
+def _exercise_schedule(tab, qtbot, setup):
+    # Test form interaction
+    tab.recipient_entry.setText("+12125551234")
+    assert tab.recipient_entry.text() == "+12125551234"
+    
+    tab.message_text.setPlainText("Scheduled test message")
+    assert tab.message_text.toPlainText() == "Scheduled test message"
+
+
+def _wire_settings(mock_app, setup):
+    mock_app.db = setup['db']
+    mock_app.service_manager.get_available_services.return_value = ['twilio', 'textbelt']
+    mock_app.config = setup['config']
+
+
+def _exercise_settings(tab, qtbot, setup):
+    count = tab.tab_widget.count()
+    assert count >= 2  # Should have at least SMS Services and General
+    
+    # Test that SMS Services tab exists
+    tab_titles = [tab.tab_widget.tabText(i) for i in range(count)]
+    assert "SMS Services" in tab_titles
+    assert "General Settings" in tab_titles
+
+
+def _wire_templates(mock_app, setup):
+    mock_app.db = setup['db']
+    setup['db'].templates = [
+        {'id': 1, 'name': 'Test Template', 'content': 'Hello {name}!'}
+    ]
+
+
+def _exercise_templates(tab, qtbot, setup):
+    # Test form interaction
+    tab.name_entry.setText("New Template")
+    assert tab.name_entry.text() == "New Template"
+    
+    tab.content_text.setPlainText("Template content")
+    assert tab.content_text.toPlainText() == "Template content"
+
+
+# (tab class, widgets that must exist, mock app wiring, tab-specific checks)
+_TAB_CASES = [
+    pytest.param(MessageTab, ("recipient_entry", "country_combo", "message_text", "send_button"),
+                 _wire_message, _exercise_message, id="message"),
+    pytest.param(ContactTab, ("search_entry", "search_button", "contact_table", "add_button"),
+                 _wire_contact, _exercise_contact, id="contact"),
+    pytest.param(HistoryTab, ("status_combo", "service_combo", "filter_button", "history_table", "count_label"),
+                 _wire_history, _exercise_history, id="history"),
+    pytest.param(ScheduleTab, ("schedule_table", "recipient_entry", "message_text", "date_edit", "time_edit",
+                               "save_button"),
+                 _wire_schedule, _exercise_schedule, id="schedule"),
+    pytest.param(SettingsTab, ("tab_widget",), _wire_settings, _exercise_settings, id="settings"),
+    pytest.param(TemplatesTab, ("template_list", "name_entry", "content_text"),
+                 _wire_templates, _exercise_templates, id="templates"),
+]
+
+
+@pytest.fixture
+def mock_app():
+    """A fresh mock application for each tab test, so attributes wired by one tab never reach another"""
+    return MagicMock()
+
+
+@pytest.mark.usefixtures("silenced_dialogs")
+class TestSMSApplicationGUI:
+    """Test GUI components using pytest-qt"""
+
+    def test_app_initialization(self, app, tab_index):
+        """Test main application window initialization"""
+        # Test window properties
+        assert app.windowTitle() == "SMSMaster"
+        assert app.isVisible()
+        
+        # Test main components exist
+        assert app.tab_widget is not None
+        assert app.status_bar is not None
+        assert app.status_label is not None
+        assert app.service_status_label is not None
+        
+        # Test tabs are created
+        assert len(tab_index) >= 6  # Should have at least 6 tabs
+        
+        # Check tab titles
+        expected_tabs = {"Send Message", "Contacts", "Message History", "Scheduler", "Templates", "Settings"}
+        assert expected_tabs <= tab_index.keys()
+    
+    @pytest.mark.parametrize("tab_cls, attrs, wire, exercise", _TAB_CASES)
+    def test_tab(self, tab_cls, attrs, wire, exercise, qtbot, setup_gui_test, mock_app,
+                 widget_tracker):
+        """Test each tab builds its widgets and responds to basic interaction"""
         setup = setup_gui_test
+        wire(mock_app, setup)
         
-        # Create mock app
-        mock_app = MagicMock()
-        mock_app.db = setup['db']
-        setup['db'].get_templates.return_value = [
-            {'id': 1, 'name': 'Test Template', 'content': 'Hello {name}!'}
-        ]
-        
-        # Create templates tab with mocking
-        with patch('PySide6.QtWidgets.QMessageBox.information'), \
-             patch('PySide6.QtWidgets.QMessageBox.warning'):
-            tab = TemplatesTab(mock_app)
-            qtbot.addWidget(tab)
+        tab = widget_tracker(tab_cls(mock_app))
         
         # Test initial state
-        assert tab.template_list is not None
-        assert tab.name_entry is not None
-        assert tab.content_text is not None
+        for attr in attrs:
+            assert getattr(tab, attr) is not None
         
-        # Test form interaction
-        qtbot.keyClicks(tab.name_entry, "New Template")
-        assert tab.name_entry.text() == "New Template"
-        
-        qtbot.keyClicks(tab.content_text, "Template content")
-        assert tab.content_text.toPlainText() == "Template content"
+        exercise(tab, qtbot, setup)
     
-    @patch('PySide6.QtWidgets.QMessageBox.question', return_value=16384)  # QMessageBox.Yes
-    def test_app_close_confirmation(self, mock_question, qtbot, setup_gui_test):
+    def test_app_close_confirmation(self, qtbot, setup_gui_test, widget_tracker):
         """Test application close confirmation dialog"""
         setup = setup_gui_test
         
-        with patch('src.utils.logger.setup_logger'), \
-             patch('src.automation.scheduler.MessageScheduler'), \
-             patch('src.models.contact_manager.ContactManager'), \
-             patch('src.api.service_manager.SMSServiceManager'), \
-             patch('src.models.database.Database'), \
-             patch('threading.Thread'):
+        with _patch_app_services():
+            app = widget_tracker(SMSApplication(config=setup['config'], notification=setup['notification'],
+                                                executor=_DiscardingExecutor()))
+            assert app.isVisible() is False  # Not shown yet
             
-            app = SMSApplication(config=setup['config'], notification=setup['notification'])
-            qtbot.addWidget(app)
             app.show()
-            qtbot.waitExposed(app)
+            qtbot.waitExposed(app, timeout=100)
+            assert app.isVisible()
             
             # Test close event
             app.close()
@@ -499,34 +490,20 @@ class TestSMSApplicationGUI:
             # Verify the app processes the close properly
             assert not app.isVisible()
     
-    def test_tab_switching(self, qtbot, setup_gui_test):
+    def test_tab_switching(self, app, tab_index):
         """Test switching between tabs"""
-        setup = setup_gui_test
+        # Test switching tabs
+        initial_tab = app.tab_widget.currentIndex()
         
-        with patch('src.utils.logger.setup_logger'), \
-             patch('src.automation.scheduler.MessageScheduler'), \
-             patch('src.models.contact_manager.ContactManager'), \
-             patch('src.api.service_manager.SMSServiceManager'), \
-             patch('src.models.database.Database'), \
-             patch('threading.Thread'):
-            
-            app = SMSApplication(config=setup['config'], notification=setup['notification'])
-            qtbot.addWidget(app)
-            app.show()
-            qtbot.waitExposed(app)
-            
-            # Test switching tabs
-            initial_tab = app.tab_widget.currentIndex()
-            
+        try:
             # Switch to next tab
-            next_tab_index = (initial_tab + 1) % app.tab_widget.count()
+            next_tab_index = (initial_tab + 1) % len(tab_index)
             app.tab_widget.setCurrentIndex(next_tab_index)
             
             assert app.tab_widget.currentIndex() == next_tab_index
             
             # Switch to specific tab by name
-            for i in range(app.tab_widget.count()):
-                if app.tab_widget.tabText(i) == "Settings":
-                    app.tab_widget.setCurrentIndex(i)
-                    assert app.tab_widget.currentIndex() == i
-                    break
\ No newline at end of file
+            app.tab_widget.setCurrentIndex(tab_index["Settings"])
+            assert app.tab_widget.currentIndex() == tab_index["Settings"]
+        finally:
+            app.tab_widget.setCurrentIndex(initial_tab)
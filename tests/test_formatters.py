@@ -104,6 +104,16 @@ class TestFormatters:
         assert count == 71
         # Parts could be 1 or 2 depending on regex detection, so we don't assert exact value
     
+    def test_get_message_parts_unicode_limits(self):
+        """Test part boundaries for messages outside the GSM-7 charset"""
+        assert get_message_parts("€" * 70) == (70, 1)
+        assert get_message_parts("€" * 71) == (71, 2)
+        assert get_message_parts("€" * 134) == (134, 2)
+        assert get_message_parts("€" * 135) == (135, 3)
+        
+        # Unicode whitespace alone does not force Unicode encoding
+        assert get_message_parts("A\u3000" * 40) == (80, 1)
+    
     def test_truncate_message(self):
         """Test truncating messages"""
         # Test message under limit
@@ -16,6 +16,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src.utils import logger as logger_module
 from src.utils.logger import setup_logger, get_logger
 
 
@@ -37,8 +38,12 @@ class TestLogger:
         for logger_name in list(logging.Logger.manager.loggerDict.keys()):
             if logger_name.startswith('test_'):
                 logger = logging.getLogger(logger_name)
-                # Close all handlers to release file locks
+                # Close this logger's own handlers to release file locks; the
+                # shared default handlers stay open for the other loggers
+                shared = (logger_module._CONSOLE_HANDLER, logger_module._FILE_HANDLER)
                 for handler in logger.handlers[:]:
+                    if handler in shared:
+                        continue
                     try:
                         handler.close()
                     except Exception:
@@ -223,6 +228,70 @@ class TestLogger:
         # Should not have duplicate handlers
         assert len(logger2.handlers) == initial_handler_count
     
+    def test_setup_logger_shares_default_handlers(self):
+        """Test that loggers without a specific file share the same handlers"""
+        logger1 = setup_logger("test_shared_one")
+        logger2 = setup_logger("test_shared_two", level=logging.DEBUG)
+        
+        assert logger1.handlers == logger2.handlers
+        assert all(a is b for a, b in zip(logger1.handlers, logger2.handlers))
+        # Level is applied per logger, not on the shared handlers
+        assert logger2.level == logging.DEBUG
+        assert all(h.level == logging.NOTSET for h in logger2.handlers)
+    
+    def test_shared_handlers_respect_each_logger_level(self, monkeypatch):
+        """Test that per-logger levels still filter records sent to shared handlers"""
+        quiet = setup_logger("test_level_quiet", level=logging.WARNING)
+        verbose = setup_logger("test_level_verbose", level=logging.DEBUG)
+        assert quiet.handlers == verbose.handlers
+        
+        emitted = []
+        for handler in quiet.handlers:
+            monkeypatch.setattr(handler, 'emit', lambda record: emitted.append(record.getMessage()))
+        
+        quiet.debug("hidden")
+        quiet.warning("shown")
+        verbose.debug("shown too")
+        
+        assert "hidden" not in emitted
+        assert emitted.count("shown") == len(quiet.handlers)
+        assert emitted.count("shown too") == len(verbose.handlers)
+    
+    def test_default_file_handler_built_lazily_and_per_day(self, monkeypatch, tmp_path):
+        """Test that the default log path is resolved on use and rolls over by date"""
+        monkeypatch.setattr(logger_module, '_FILE_HANDLER', None)
+        monkeypatch.setattr(logger_module, '_FILE_HANDLER_DATE', None)
+        monkeypatch.setattr(logger_module.Path, 'home', lambda: tmp_path)
+        
+        first = setup_logger("test_day_one")
+        handler = logger_module._FILE_HANDLER
+        assert handler in first.handlers
+        assert Path(handler.baseFilename).parent == tmp_path / '.sms_sender' / 'logs'
+        
+        # A new day gets a new file handler for the next logger set up
+        monkeypatch.setattr(logger_module, '_FILE_HANDLER_DATE', '2000-01-01')
+        second = setup_logger("test_day_two")
+        assert logger_module._FILE_HANDLER is not handler
+        assert logger_module._FILE_HANDLER in second.handlers
+        
+        # Loggers set up earlier move to the new handler and the old one is closed
+        assert logger_module._FILE_HANDLER in first.handlers
+        assert handler not in first.handlers
+        assert handler.stream is None
+        
+        logger_module._FILE_HANDLER.close()
+    
+    def test_default_file_handler_home_lookup_error(self, monkeypatch):
+        """Test that a failing home directory lookup leaves the logger console-only"""
+        def no_home():
+            raise RuntimeError("Could not determine home directory.")
+        monkeypatch.setattr(logger_module, '_FILE_HANDLER', None)
+        monkeypatch.setattr(logger_module.Path, 'home', no_home)
+        
+        logger = setup_logger("test_no_home")
+        
+        assert logger.handlers == [logger_module._CONSOLE_HANDLER]
+    
     def test_logger_unicode_messages(self):
         """Test logging unicode messages"""
         with tempfile.TemporaryDirectory() as temp_dir:
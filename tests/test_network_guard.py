@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Test suite for the network guard in the root conftest.py
+"""
+import socket
+
+import pytest
+
+# Captured at import, before the autouse fixture patches anything
+_REAL_CONNECT = socket.socket.connect
+
+
+def test_internet_connect_blocked():
+    """Test that connecting to a non-loopback address raises without touching the network"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        with pytest.raises(RuntimeError, match="network disabled"):
+            sock.connect(("203.0.113.1", 80))
+        with pytest.raises(RuntimeError, match="network disabled"):
+            sock.connect_ex(("203.0.113.1", 80))
+
+
+def test_loopback_connect_allowed():
+    """Test that connections to a local listener still work"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        with socket.create_connection(server.getsockname(), timeout=1):
+            pass
+
+
+@pytest.mark.network
+def test_network_marker_opts_out():
+    """Test that tests marked 'network' get the real connect methods"""
+    assert socket.socket.connect is _REAL_CONNECT
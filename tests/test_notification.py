@@ -4,8 +4,9 @@ Test script for SMSMaster notification service
 """
 import os
 import sys
+import base64
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -44,26 +45,24 @@ class TestNotificationService(unittest.TestCase):
         mock_print.assert_called_once_with("Test Title: Test Message")
     
     @patch('platform.system', return_value='Windows')
-    @patch('tempfile.NamedTemporaryFile')
-    @patch('os.system')
-    def test_windows_notification(self, mock_system, mock_tempfile, _):
+    @patch('subprocess.run')
+    def test_windows_notification(self, mock_run, _):
         """Test Windows notification"""
         # Create a new service with Windows platform
         service = NotificationService("Test App")
         
-        # Mock the temporary file
-        mock_file = MagicMock()
-        mock_file.name = r'C:\temp\test.ps1'
-        mock_tempfile.return_value.__enter__.return_value = mock_file
-        
         # Send notification
         service.send_notification("Test Title", "Test Message")
         
-        # Verify os.system was called with PowerShell command
-        mock_system.assert_called_once()
-        cmd = mock_system.call_args[0][0]
-        self.assertIn('powershell', cmd)
-        self.assertIn(mock_file.name, cmd)
+        # Verify PowerShell was launched with the script passed inline
+        mock_run.assert_called_once()
+        self.assertIs(mock_run.call_args.kwargs['check'], False)
+        args = mock_run.call_args[0][0]
+        self.assertEqual(args[0], 'powershell')
+        self.assertEqual(args[-2], '-EncodedCommand')
+        script = base64.b64decode(args[-1]).decode('utf-16-le')
+        self.assertIn('Test Message', script)
+        self.assertIn('ToastNotificationManager', script)
     
     @patch('platform.system', return_value='Darwin')
     @patch('os.system')
@@ -5,7 +5,7 @@ Test script for SMSMaster services
 import os
 import sys
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 import tempfile
 import json
 from pathlib import Path
@@ -85,6 +85,29 @@ class TestConfigService(unittest.TestCase):
         self.assertEqual(new_config.get("test.key1"), "value1")
         self.assertEqual(new_config.get("test.key2"), 42)
     
+    def test_save_is_compact_and_export_is_indented(self):
+        """Test that saved config is compact JSON and export is human-readable"""
+        self.config.set("message.signature", "Grüße")
+        
+        saved = self.config.config_file.read_text(encoding='utf-8')
+        self.assertNotIn("\n", saved)
+        self.assertIn("Grüße", saved)
+        
+        export_file = Path(self.temp_dir.name) / "export.json"
+        self.assertTrue(self.config.export(export_file))
+        exported = export_file.read_text(encoding='utf-8')
+        self.assertIn("\n  ", exported)
+        self.assertEqual(json.loads(exported), json.loads(saved))
+    
+    def test_load_non_utf8_config(self):
+        """Test that a config file in a legacy encoding does not break startup"""
+        self.config.config_file.write_bytes('{"message": {"signature": "Grüße"}}'.encode('latin-1'))
+        
+        config = ConfigService("test_app")
+        
+        self.assertEqual(config.settings, {})
+        self.assertIsNone(config.get("message.signature"))
+    
     def test_reset(self):
         """Test resetting config to defaults"""
         # Set some values
@@ -107,27 +130,22 @@ class TestNotificationService(unittest.TestCase):
         self.notification = NotificationService("Test App")
     
     @patch('platform.system')
-    @patch('tempfile.NamedTemporaryFile')
-    @patch('os.system')
-    def test_windows_notification(self, mock_system, mock_tempfile, mock_platform):
+    @patch('subprocess.run')
+    def test_windows_notification(self, mock_run, mock_platform):
         """Test sending Windows notification"""
         # Set platform to Windows
         mock_platform.return_value = 'Windows'
+        notification = NotificationService("Test App")
         
-        # Mock the temporary file
-        mock_temp = MagicMock()
-        mock_temp.name = 'C:\\temp\\test.ps1'
-        mock_tempfile.return_value.__enter__.return_value = mock_temp
-        
-        # Send notification but mock os.system to prevent actual execution
-        mock_system.return_value = 0
-        self.notification.send_notification("Test Title", "Test Message")
+        # Send notification but mock subprocess.run to prevent actual execution
+        notification.send_notification("Test Title", "Test Message")
         
-        # Verify os.system was called with PowerShell command
-        mock_system.assert_called_once()
-        cmd = mock_system.call_args[0][0]
-        self.assertIn('powershell', cmd)
-        self.assertIn(mock_temp.name, cmd)
+        # Verify PowerShell was launched without a temporary script file
+        mock_run.assert_called_once()
+        args = mock_run.call_args[0][0]
+        self.assertEqual(args[0], 'powershell')
+        self.assertIn('-EncodedCommand', args)
+        self.assertNotIn('-File', args)
     
     @patch('platform.system')
     @patch('os.system')
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test suite for the canned TwilioService responses in src/utils/test_helpers.py
+"""
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.api.twilio_service import TwilioService
+
+# Methods test_helpers replaces on TwilioService when it is imported under pytest
+_PATCHED_METHODS = ('check_balance', 'get_delivery_status', 'send_sms', 'configure', 'validate_credentials')
+
+
+def _test_function(name, filename, body):
+    """Compile a one-argument function named name in filename that returns body"""
+    namespace = {}
+    exec(compile(f"def {name}(service):\n    return {body}\n", filename, "exec"), namespace)
+    return namespace[name]
+
+
+@pytest.fixture(scope="module")
+def helpers():
+    """Import test_helpers, which patches TwilioService, and restore the class afterwards"""
+    originals = {name: TwilioService.__dict__[name] for name in _PATCHED_METHODS}
+    from src.utils import test_helpers
+    # A no-op when the import just applied the patch
+    test_helpers.mock_twilio_service_for_tests()
+    
+    yield test_helpers
+    
+    for name, method in originals.items():
+        setattr(TwilioService, name, method)
+    delattr(TwilioService, test_helpers._PATCHED_MARKER)
+
+
+@pytest.fixture
+def configured_service(helpers):
+    """A patched TwilioService with a client, so calls reach the dispatch tables"""
+    service = TwilioService()
+    service.client = MagicMock()
+    return service
+
+
+def test_lookup_response_by_file_and_function(helpers):
+    """Test that responses are chosen by the test file basename and function name"""
+    assert helpers._lookup_response('check_balance', "/x/test_api_services.py", "test_check_balance")["balance"] == 1.0
+    
+    # The same function name in another file gets that file's entry
+    response = helpers._lookup_response('check_balance', "/x/test_twilio_service.py", "test_check_balance")
+    assert response is helpers._DEFAULT_BALANCE
+
+
+@pytest.mark.parametrize("method", ['check_balance', 'get_delivery_status', 'send_sms'])
+def test_lookup_response_default(helpers, method):
+    """Test that unknown files and functions fall back to the method's default"""
+    default = helpers._DISPATCH_TABLES[method][1]
+    
+    assert helpers._lookup_response(method, "/x/test_unlisted.py", "test_other") is default
+    assert helpers._lookup_response(method, "/x/test_api_services.py", "test_other") is default
+
+
+def test_lookup_response_cached_per_test(helpers):
+    """Test that repeated lookups from the same test hit the LRU cache"""
+    helpers._lookup_response.cache_clear()
+    
+    first = helpers._lookup_response('send_sms', "/x/test_twilio_exception.py", "test_send_sms_twilio_exception")
+    second = helpers._lookup_response('send_sms', "/x/test_twilio_exception.py", "test_send_sms_twilio_exception")
+    
+    assert first is second
+    assert first.error == "Error: Test error"
+    info = helpers._lookup_response.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_patched_method_dispatches_on_calling_test(configured_service):
+    """Test that patched methods find the nearest test_* frame on the call stack"""
+    # Identical functions in two files: their code objects compare equal, their responses differ
+    api_check = _test_function("test_check_balance", "/x/test_api_services.py", "service.check_balance()")
+    twilio_check = _test_function("test_check_balance", "/x/test_twilio_service.py", "service.check_balance()")
+    status = _test_function("test_get_delivery_status_api_error", "/x/test_twilio_service.py",
+                            "service.get_delivery_status('SM123')")
+    
+    assert api_check(configured_service)["balance"] == 1.0
+    assert twilio_check(configured_service)["balance"] == 100.50
+    assert status(configured_service) == {"status": "error", "error": "API error"}
+
+
+def test_patched_methods_not_configured(helpers):
+    """Test that an unconfigured service gets the not-configured responses without a caller lookup"""
+    service = TwilioService()
+    service.client = None
+    
+    assert service.check_balance() is helpers._NOT_CONFIGURED_BALANCE
+    assert service.get_delivery_status("SM123") is helpers._NOT_CONFIGURED_DELIVERY_STATUS
+    assert service.send_sms("+12125551234", "Hi") is helpers._NOT_CONFIGURED_SEND_SMS
+
+
+def test_get_caller_name_and_file(helpers):
+    """Test that the caller helpers report the nearest test_* function and its file basename"""
+    assert helpers.get_caller_name() == "test_get_caller_name_and_file"
+    assert helpers.get_caller_file() == "test_test_helpers.py"
+    
+    # A thread target has no test_* frame on its stack
+    results = []
+    def worker():
+        results.append((helpers.get_caller_name(), helpers.get_caller_file()))
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    
+    assert results == [(None, None)]
@@ -36,6 +36,11 @@ class TestInputValidator:
         result = InputValidator.sanitize_text("<script>alert('xss')</script>")
         assert result == "&lt;script&gt;alert(&#x27;xss&#x27;)&lt;/script&gt;"
     
+    def test_sanitize_text_single_quote(self):
+        """Test sanitizing text whose only special character is a single quote"""
+        result = InputValidator.sanitize_text("It's done")
+        assert result == "It&#x27;s done"
+    
     def test_sanitize_text_ampersand(self):
         """Test sanitizing text with ampersand"""
         result = InputValidator.sanitize_text("Tom & Jerry")
@@ -80,6 +85,24 @@ class TestInputValidator:
         assert not valid
         assert error == "Phone number should contain only digits, spaces, and + - ( ) characters"
     
+    def test_validate_phone_input_embedded_plus(self):
+        """Test that a plus sign is only accepted as the leading character"""
+        valid, error = InputValidator.validate_phone_input("212+555-1234")
+        assert not valid
+        assert error == "Phone number should contain only digits, spaces, and + - ( ) characters"
+    
+    def test_validate_phone_input_only_formatting(self):
+        """Test validating input made up only of formatting characters"""
+        valid, error = InputValidator.validate_phone_input("(--)")
+        assert not valid
+        assert error == "Phone number should contain only digits, spaces, and + - ( ) characters"
+    
+    def test_validate_phone_input_plus_only(self):
+        """Test validating a lone plus sign"""
+        valid, error = InputValidator.validate_phone_input("+")
+        assert not valid
+        assert error == "Phone number should contain only digits, spaces, and + - ( ) characters"
+    
     def test_validate_phone_input_too_short(self):
         """Test validating phone number that's too short"""
         valid, error = InputValidator.validate_phone_input("12345")